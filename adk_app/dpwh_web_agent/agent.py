@@ -3,46 +3,69 @@ from __future__ import annotations
 import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
 
 # Ensure the repo root is on sys.path so imports like `dpwh_agent.*` and `dpwh_web_agent.*` work
 _HERE = Path(__file__).resolve()
 _REPO_ROOT = _HERE.parents[2]  # <root>/adk_app/dpwh_web_agent/agent.py -> parents[2] = <root>
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
-    
-load_dotenv(dotenv_path=_REPO_ROOT / ".env", override=True)
 
-# Load .env at repo root if present (GOOGLE_API_KEY, GEMINI_MODEL, etc.)
-# try:
-#     from dotenv import load_dotenv
-#     load_dotenv(dotenv_path=_REPO_ROOT / ".env", override=True)
-# except Exception:
-#     pass
 
+def _load_env() -> None:
+    """Load .env at repo root if present (GOOGLE_API_KEY, GEMINI_MODEL, etc.).
 
-from google.adk.agents import Agent  # type: ignore
+    Variables already set in the environment (e.g. injected by a deployment)
+    take precedence over the file.
+    """
+    env_path = _REPO_ROOT / ".env"
+    if not env_path.exists():
+        return
+    from dotenv import load_dotenv
 
-from dpwh_web_agent import prompt
-from dpwh_web_agent.sub_agents.data_prep.agent import data_prep_agent
-from dpwh_web_agent.sub_agents.analytics.agent import analytics_agent
-from dpwh_web_agent.tools.memory import _load_precreated_dataset
+    load_dotenv(dotenv_path=env_path, override=False)
 
 
-root_agent = Agent(
-    model=os.environ.get("GEMINI_MODEL", "gemini-2.5-flash"),
-    name="root_agent",
-    description="DPWH analytics agent using multiple sub-agents, Always greet the user first with a friendly welcome message.",
-    instruction=prompt.ROOT_AGENT_INSTR,
-    sub_agents=[
-        data_prep_agent,
-        analytics_agent,
-    ],
-    before_agent_callback=_load_precreated_dataset,
-)
+_load_env()
+
+
+def _build_root_agent():
+    """Construct the ADK root agent.
+
+    The google.adk runtime (and the pandas-backed sub-agents) take seconds to
+    import, so this only runs the first time `root_agent` is accessed.
+    """
+    from google.adk.agents import Agent  # type: ignore
+
+    from dpwh_web_agent import prompt
+    from dpwh_web_agent.sub_agents.data_prep.agent import data_prep_agent
+    from dpwh_web_agent.sub_agents.analytics.agent import analytics_agent
+    from dpwh_web_agent.tools.memory import _load_precreated_dataset
+
+    return Agent(
+        model=os.environ.get("GEMINI_MODEL", "gemini-2.5-flash"),
+        name="root_agent",
+        description="DPWH analytics agent using multiple sub-agents, Always greet the user first with a friendly welcome message.",
+        instruction=prompt.ROOT_AGENT_INSTR,
+        sub_agents=[
+            data_prep_agent,
+            analytics_agent,
+        ],
+        before_agent_callback=_load_precreated_dataset,
+    )
+
+
+def __getattr__(name: str):
+    # Module-level lazy attribute: build `root_agent` on first access and cache it
+    # as a real global so later lookups bypass this hook.
+    if name == "root_agent":
+        agent = _build_root_agent()
+        globals()["root_agent"] = agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
+    root_agent = __getattr__("root_agent")
     # Try to start ADK Web UI using common entrypoints with graceful fallback.
     port = int(os.environ.get("PORT", "8000"))
     try:
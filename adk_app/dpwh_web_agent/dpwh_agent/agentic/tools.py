@@ -7,43 +7,158 @@ Design goals:
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import datetime
+import functools
 import threading
 import re
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # type: ignore
+    import pyarrow.compute as pc  # type: ignore
+except Exception:  # pragma: no cover - optional; falls back to numpy string search
+    pa = None
+    pc = None
+
 from dpwh_web_agent.dpwh_agent.agents.agent3_answer import (
+    REQUIRE_CONFIRM,
     agent3_run,
     find_project_id_column,
 )
-from dpwh_web_agent.dpwh_agent.agents.agent3_answer import _set_pagination, _PAGINATION_STATE
+from dpwh_web_agent.dpwh_agent.agents.agent3_answer import _set_pagination, _PAGINATION_STATE, _LazyRows
 from dpwh_web_agent.dpwh_agent.utils.schema import find_column
 
 
+# Writers serialize on the lock; readers just index the holder, which is a
+# single atomic load and keeps the hot tool path lock-free.
 _DF_LOCK = threading.Lock()
-_CURRENT_DF: Optional[pd.DataFrame] = None
+_DF_REF: List[Optional[pd.DataFrame]] = [None]
+# Bumped on every set_dataframe so cached answers never outlive their dataset.
+_DF_VERSION = 0
+
+_CONTRACTOR_CANDIDATES = [
+    "contractor",
+    "contractor_name",
+    "winning_contractor",
+]
+_BUDGET_CANDIDATES = [
+    "approved_budget_num",
+    "approved_budget_for_contract",
+    "approvedbudgetforcontract",
+    "approved_budget",
+    "budget",
+    "contractcost",
+    "approved budget for contract",
+]
+_YEAR_CANDIDATES = [
+    "funding_year",
+    "funding year",
+    "fundingyear",
+    "year",
+    "fy",
+    "funding_years",
+]
+# Column roles resolved once per dataset; replaced wholesale by set_dataframe.
+_SCHEMA: Dict[str, Optional[str]] = {}
+# Derived per-dataset columns (casefolded names, numeric years, ...), keyed by
+# (id(df), name). Cleared by set_dataframe.
+_CACHE: Dict[Tuple[int, Any], Any] = {}
+
+
+def _resolve_schema(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    return {
+        "contractor": find_column(df, _CONTRACTOR_CANDIDATES),
+        "budget": find_column(df, _BUDGET_CANDIDATES),
+        "project_id": find_project_id_column(df),
+        "year": find_column(df, _YEAR_CANDIDATES),
+    }
 
 
 def set_dataframe(df: pd.DataFrame) -> None:
     """Set the current dataframe used by tool functions."""
-    global _CURRENT_DF
+    global _DF_VERSION, _SCHEMA
     with _DF_LOCK:
-        _CURRENT_DF = df
+        _SCHEMA = _resolve_schema(df)
+        _DF_REF[0] = df
+        _DF_VERSION += 1
+        _agent_answer_cached.cache_clear()
+        _CACHE.clear()
+
+
+def _cached(df: pd.DataFrame, name: Any, build: Callable[[], Any]) -> Any:
+    key = (id(df), name)
+    value = _CACHE.get(key)
+    if value is None:
+        value = build()
+        _CACHE[key] = value
+    return value
+
+
+def _overall_stats(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Whole-dataset figures for unfiltered questions, or None to defer to Agent 3.
+
+    Agent 3 answers with a clarification prompt when REQUIRE_CONFIRM is set,
+    and the empty dataset has its own messages, so both go through it.
+    """
+    if REQUIRE_CONFIRM or df.empty:
+        return None
+
+    def build() -> Dict[str, Any]:
+        budget_col = _SCHEMA.get("budget")
+        total = pd.to_numeric(df[budget_col], errors="coerce").sum() if budget_col else None
+        return {"n_rows": len(df), "total_budget": total}
+    return _cached(df, "overall_stats", build)
 
 
 def _require_df() -> pd.DataFrame:
-    with _DF_LOCK:
-        if _CURRENT_DF is None:
-            raise RuntimeError("Dataset not initialized. Call set_dataframe(df) first.")
-        return _CURRENT_DF
+    df = _DF_REF[0]
+    if df is None:
+        raise RuntimeError("Dataset not initialized. Call set_dataframe(df) first.")
+    return df
+
+
+class _Uncacheable(Exception):
+    """Carries an answer that touched pagination state and must not be memoized."""
+
+    def __init__(self, answer: str):
+        super().__init__(answer)
+        self.answer = answer
+
+
+@functools.lru_cache(maxsize=512)
+def _agent_answer_cached(question: str, df_version: int, today: datetime.date) -> str:
+    # ``today`` is part of the key because status filters and 'this year'
+    # style phrases are resolved against the current date
+    df = _require_df()
+    seq = _PAGINATION_STATE.get("seq")
+    answer = agent3_run(question, df)
+    # Pagination answers depend on (and advance) shared state, so replaying
+    # them from the cache would be wrong; lru_cache does not store raises.
+    if _PAGINATION_STATE.get("seq") != seq:
+        raise _Uncacheable(answer)
+    return answer
+
+
+_WS_RE = re.compile(r"\s+")
+_YEAR_RANGE_RE = re.compile(r"(\d{2,4})\s*(?:-|–|—|to)\s*(\d{2,4})", re.IGNORECASE)
+_YEAR_NUM_RE = re.compile(r"\d{2,4}")
+
+
+def _normalize_question(question: str) -> str:
+    """Collapse whitespace so trivially different phrasings share a cache entry."""
+    return _WS_RE.sub(" ", str(question)).strip()
 
 
 def _agent_answer(question: str) -> str:
     """Run Agent 3 safely and return a string even if an internal error occurs."""
-    df = _require_df()
+    _require_df()
     try:
-        return agent3_run(question, df)
+        return _agent_answer_cached(_normalize_question(question), _DF_VERSION, datetime.date.today())
+    except _Uncacheable as u:
+        return u.answer
     except Exception as e:
         # Return a user-friendly error so the model doesn't surface a tool failure
         return (
@@ -52,31 +167,61 @@ def _agent_answer(question: str) -> str:
         )
 
 
+# Region shorthands -> canonical names used by Agent 3's parser
+_PLACE_ALIASES: Dict[str, str] = {
+    # Common region shorthands
+    "ncr": "National Capital Region",
+    "national capital region": "National Capital Region",
+    "metro manila": "National Capital Region",
+    "metropolitan manila": "National Capital Region",
+    "car": "Cordillera Administrative Region",
+    "cordillera": "Cordillera Administrative Region",
+    "cordillera administrative region": "Cordillera Administrative Region",
+    # Region IV variants
+    "4a": "Region IV-A",
+    "iv-a": "Region IV-A",
+    "region 4a": "Region IV-A",
+    "region iv-a": "Region IV-A",
+    "4b": "Region IV-B",
+    "iv-b": "Region IV-B",
+    "region 4b": "Region IV-B",
+    "region iv-b": "Region IV-B",
+}
+
+
+@functools.lru_cache(maxsize=256)
 def _fmt_place_token(token: str) -> str:
     """Normalize location tokens for better intent parsing (e.g., 'Region 2' over plain '2')."""
     if not token:
         return token
     t = str(token).strip()
     low = t.lower()
-    # Common region shorthands
-    if low in {"ncr", "national capital region", "metro manila", "metropolitan manila"}:
-        return "National Capital Region"
-    if low in {"car", "cordillera", "cordillera administrative region"}:
-        return "Cordillera Administrative Region"
-    # Region IV variants
-    if low in {"4a", "iv-a", "region 4a", "region iv-a"}:
-        return "Region IV-A"
-    if low in {"4b", "iv-b", "region 4b", "region iv-b"}:
-        return "Region IV-B"
+    alias = _PLACE_ALIASES.get(low)
+    if alias is not None:
+        return alias
     # Pure digits – prefer explicit 'Region N'
     if low.isdigit():
         return f"Region {t}"
-    # Already looks like 'Region X'
-    if low.startswith("region "):
-        return t
+    # Anything else, including 'Region X', passes through unchanged
     return t
 
 
+def _join_place(municipality: Optional[str] = None,
+                province: Optional[str] = None,
+                region: Optional[str] = None) -> str:
+    """Join the given location parts (most specific first) into one place string."""
+    parts = [p for p in (municipality, province, _fmt_place_token(region) if region else None) if p]
+    return ", ".join(parts)
+
+
+def _build_place(municipality: Optional[str] = None,
+                 province: Optional[str] = None,
+                 region: Optional[str] = None) -> str:
+    """Return the ' in <place>' suffix for a tool question, or '' without a location."""
+    place = _join_place(municipality, province, region)
+    return f" in {place}" if place else ""
+
+
 def _parse_years_input(year_str: str) -> Optional[List[int]]:
     """Parse a year or a small range/list string into a list of years.
 
@@ -96,7 +241,7 @@ def _parse_years_input(year_str: str) -> Optional[List[int]]:
     s_clean = s.replace('\u2013', '-').replace('\u2014', '-')  # normalize dashes
 
     # Range like 2020-2022 or 20-22 or "2020 to 2022"
-    m = re.search(r"(\d{2,4})\s*(?:-|–|—|to)\s*(\d{2,4})", s_clean, flags=re.IGNORECASE)
+    m = _YEAR_RANGE_RE.search(s_clean)
     if m:
         a = int(m.group(1))
         b = int(m.group(2))
@@ -110,7 +255,7 @@ def _parse_years_input(year_str: str) -> Optional[List[int]]:
         return list(range(start, end + 1))
 
     # Otherwise collect any 2-4 digit numbers (comma separated or space separated)
-    nums = re.findall(r"\d{2,4}", s_clean)
+    nums = _YEAR_NUM_RE.findall(s_clean)
     years: List[int] = []
     for n in nums:
         y = int(n)
@@ -160,15 +305,8 @@ def top_contractors_by_count(top_n: int = 10, municipality: Optional[str] = None
     Returns:
         A bullet list of contractors with project counts.
     """
-    df = _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = f" in {' ,'.join(where)}" if where else ""
+    _require_df()
+    place = _build_place(municipality, province, region)
     q = f"top {top_n} contractors by number of projects{place}"
     return _agent_answer(q)
 
@@ -176,15 +314,8 @@ def top_contractors_by_count(top_n: int = 10, municipality: Optional[str] = None
 def top_contractors_by_budget(top_n: int = 10, municipality: Optional[str] = None,
                               province: Optional[str] = None, region: Optional[str] = None) -> str:
     """List top contractors by total approved budget with optional location filter."""
-    df = _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = f" in {' ,'.join(where)}" if where else ""
+    _require_df()
+    place = _build_place(municipality, province, region)
     q = f"top {top_n} contractors by total budget{place}"
     return _agent_answer(q)
 
@@ -200,14 +331,11 @@ def total_approved_budget(municipality: Optional[str] = None,
                           region: Optional[str] = None) -> str:
     """Compute total approved budget optionally filtered by location."""
     df = _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = f" in {' ,'.join(where)}" if where else ""
+    if not (municipality or province or region):
+        stats = _overall_stats(df)
+        if stats is not None and stats["total_budget"] is not None:
+            return f"The total approved budget for all projects is ₱{stats['total_budget']:,.2f}."
+    place = _build_place(municipality, province, region)
     q = f"total approved budget{place}"
     return _agent_answer(q)
 
@@ -221,14 +349,7 @@ def budget_trend_by_year(municipality: Optional[str] = None,
     instead of relying on generic QA routing.
     """
     _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = f" in {' ,'.join(where)}" if where else ""
+    place = _build_place(municipality, province, region)
     q = f"budget trend by year{place}"
     return _agent_answer(q)
 
@@ -240,14 +361,7 @@ def contractor_max_total_budget(municipality: Optional[str] = None,
                                 region: Optional[str] = None) -> str:
     """Which contractor has the highest total approved budget (optionally in a place)."""
     _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = f" in {' ,'.join(where)}" if where else ""
+    place = _build_place(municipality, province, region)
     q = f"which contractor has the highest approved budget{place}"
     return _agent_answer(q)
 
@@ -257,14 +371,7 @@ def contractor_max_count(municipality: Optional[str] = None,
                          region: Optional[str] = None) -> str:
     """Which contractor has the most projects (optionally in a place)."""
     _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = f" in {' ,'.join(where)}" if where else ""
+    place = _build_place(municipality, province, region)
     q = f"which contractor has the most projects{place}"
     return _agent_answer(q)
 
@@ -275,19 +382,14 @@ def count_projects(municipality: Optional[str] = None,
                    contractor: Optional[str] = None) -> str:
     """Count projects with optional filters for location or contractor."""
     df = _require_df()
+    if not (municipality or province or region or contractor):
+        stats = _overall_stats(df)
+        if stats is not None:
+            return f"There are {stats['n_rows']} flood control projects in the dataset."
     parts = ["how many projects"]
     if contractor:
         parts.append(f"contractor {contractor} have")
-    place = []
-    if municipality:
-        place.append(municipality)
-    if province:
-        place.append(province)
-    if region:
-        place.append(_fmt_place_token(region))
-    q = " ".join(parts)
-    if place:
-        q += f" in {' ,'.join(place)}"
+    q = " ".join(parts) + _build_place(municipality, province, region)
     return _agent_answer(q)
 
 
@@ -305,14 +407,7 @@ def count_projects_in_year(year: Optional[str] = None) -> str:
         return "Please provide a funding year (e.g., 2020)."
 
     # Find a likely year column — try several common variants for robustness
-    year_col = find_column(df, [
-        "funding_year",
-        "funding year",
-        "fundingyear",
-        "year",
-        "fy",
-        "funding_years",
-    ])
+    year_col = _SCHEMA.get("year")
     if year_col is None:
         # Fall back to agent parsing which may understand date-like columns
         return _agent_answer(f"how many projects in the year {year}")
@@ -323,7 +418,7 @@ def count_projects_in_year(year: Optional[str] = None) -> str:
         return "Please provide a funding year (e.g., 2020) or a range like 2020-2022."
 
     # Coerce year column to numeric once
-    series = pd.to_numeric(df[year_col], errors="coerce")
+    series = _cached(df, ("year_num", year_col), lambda: pd.to_numeric(df[year_col], errors="coerce"))
 
     if len(years) == 1:
         y = years[0]
@@ -362,16 +457,9 @@ def highest_budget(top_n: int = 1, municipality: Optional[str] = None,
                    province: Optional[str] = None,
                    region: Optional[str] = None) -> str:
     """Get the project(s) with the highest approved budget, optionally filtered by location."""
-    df = _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
+    _require_df()
     prefix = f"top {top_n} " if top_n and top_n > 1 else ""
-    place = f" in {' ,'.join(where)}" if where else ""
+    place = _build_place(municipality, province, region)
     q = f"{prefix}highest approved budget{place}"
     # Use the safe wrapper to avoid propagating exceptions into the model's tool-calling path
     return _agent_answer(q)
@@ -381,16 +469,9 @@ def lowest_budget(top_n: int = 1, municipality: Optional[str] = None,
                   province: Optional[str] = None,
                   region: Optional[str] = None) -> str:
     """Get the project(s) with the lowest approved budget, optionally filtered by location."""
-    df = _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
+    _require_df()
     prefix = f"top {top_n} " if top_n and top_n > 1 else ""
-    place = f" in {' ,'.join(where)}" if where else ""
+    place = _build_place(municipality, province, region)
     q = f"{prefix}lowest approved budget{place}"
     # Use the safe wrapper to avoid propagating exceptions into the model's tool-calling path
     return _agent_answer(q)
@@ -398,6 +479,36 @@ def lowest_budget(top_n: int = 1, municipality: Optional[str] = None,
 
 # --- New contractor-focused helpers ---------------------------------------------------------
 
+def _contractor_index(df: pd.DataFrame, contractor_col: str) -> Tuple[np.ndarray, Any]:
+    """Row -> name code, plus the distinct casefolded contractor names.
+
+    The names are kept as a pyarrow array when pyarrow is available so the
+    substring search runs in an Arrow kernel that releases the GIL.
+    """
+    def build() -> Tuple[np.ndarray, Any]:
+        codes, names = pd.factorize(df[contractor_col].astype(str), sort=False)
+        folded = pd.Index(names).str.casefold()
+        if pa is not None:
+            return codes, pa.array(folded.tolist(), type=pa.string())
+        return codes, folded.to_numpy(dtype=str)
+    return _cached(df, ("contractor_index", contractor_col), build)
+
+
+def _contractor_mask(df: pd.DataFrame, contractor_col: str, target: str) -> np.ndarray:
+    """Boolean mask of rows whose contractor contains ``target`` (case-insensitive).
+
+    An exact (stripped) match is always also a substring match, so a single
+    literal find over the distinct names covers both cases; the per-name hits
+    are then gathered back to rows through the factorized codes.
+    """
+    codes, folded = _contractor_index(df, contractor_col)
+    if pc is not None and isinstance(folded, pa.Array):
+        hits = pc.match_substring(folded, pattern=target.casefold()).to_numpy(zero_copy_only=False)
+    else:
+        hits = np.char.find(folded, target.casefold()) >= 0
+    return hits[codes]
+
+
 def top_projects_for_contractor(contractor: str, top_n: int = 5) -> str:
     """Return the top-N projects by approved budget for a contractor.
 
@@ -415,65 +526,68 @@ def top_projects_for_contractor(contractor: str, top_n: int = 5) -> str:
     if not contractor or not str(contractor).strip():
         return "Please provide a contractor name."
 
-    contractor_col = find_column(df, [
-        "contractor",
-        "contractor_name",
-        "winning_contractor",
-    ])
-    budget_col = find_column(df, [
-        "approved_budget_num",
-        "approved_budget_for_contract",
-        "approvedbudgetforcontract",
-        "approved_budget",
-        "budget",
-        "contractcost",
-        "approved budget for contract",
-    ])
+    contractor_col = _SCHEMA.get("contractor")
+    budget_col = _SCHEMA.get("budget")
     if contractor_col is None or budget_col is None:
         return "I couldn't find the required columns (contractor/budget)."
 
-    # Filter to the contractor (case-insensitive contains; prefer exact match if available)
-    series = df[contractor_col].astype(str)
+    pid_col = _SCHEMA.get("project_id")
+
+    # Filter to the contractor (case-insensitive contains; prefer exact match if available).
+    # Only the columns rendered below are taken, not a copy of every column.
     target = str(contractor).strip()
-    exact_mask = series.str.strip().str.casefold() == target.casefold()
-    mask = exact_mask | series.str.casefold().str.contains(target.casefold(), na=False)
-    sub = df[mask].copy()
+    cols = list(dict.fromkeys(c for c in (pid_col, contractor_col, budget_col) if c is not None))
+    sub = df.loc[_contractor_mask(df, contractor_col, target), cols]
     if sub.empty:
         return f"I couldn't find any projects for contractor {target}."
 
     # Coerce budget and sort
-    sub[budget_col] = pd.to_numeric(sub[budget_col], errors="coerce")
+    sub = sub.assign(**{budget_col: pd.to_numeric(sub[budget_col], errors="coerce")})
     sub = sub.dropna(subset=[budget_col])
     if sub.empty:
         return f"No projects with a valid approved budget for contractor {target}."
 
-    # Respect requested top_n but prepare the full sorted list for pagination
+    # Respect requested top_n. Only a small buffer of the largest budgets is
+    # formatted up front; the rest of the sorted list is built if the user
+    # pages past it.
     n_req = int(top_n or 5)
-    tmp_sorted = sub.sort_values(by=budget_col, ascending=False)
-
-    pid_col = find_project_id_column(tmp_sorted)
-    lines: List[str] = []
-    for _, r in tmp_sorted.iterrows():
-        pid = r.get(pid_col, "N/A")
-        contr_val = r.get(contractor_col, target)
-        amt = float(r[budget_col]) if pd.notna(r[budget_col]) else None
-        if amt is not None:
-            lines.append(f"- {pid} — {contr_val} — ₱{amt:,.2f}")
-        else:
-            lines.append(f"- {pid} — {contr_val}")
-
-    # Prepare pagination state so follow-ups like 'more' work
-    prepared: List[Tuple[str, str]] = []
-    for line in lines:
-        # line format: '- PID — ...' -> extract pid and rest
-        l = line.lstrip('- ').strip()
-        parts = l.split(' — ', 1)
-        pid = parts[0]
-        rest = parts[1] if len(parts) > 1 else ''
-        prepared.append((pid, rest))
+    total = len(sub)
+    head = sub.nlargest(max(n_req, 5) * 4, budget_col)
+
+    def _prepare(frame: pd.DataFrame) -> List[Tuple[str, str]]:
+        lines: List[str] = []
+        n = len(frame)
+        pids = frame[pid_col].tolist() if pid_col in frame.columns else ["N/A"] * n
+        contrs = frame[contractor_col].tolist() if contractor_col in frame.columns else [target] * n
+        for pid, contr_val, amt in zip(pids, contrs, frame[budget_col].tolist()):
+            amt = float(amt) if pd.notna(amt) else None
+            if amt is not None:
+                lines.append(f"- {pid} — {contr_val} — ₱{amt:,.2f}")
+            else:
+                lines.append(f"- {pid} — {contr_val}")
+
+        # Prepare pagination state so follow-ups like 'more' work
+        prepared: List[Tuple[str, str]] = []
+        for line in lines:
+            # line format: '- PID — ...' -> extract pid and rest
+            l = line.lstrip('- ').strip()
+            parts = l.split(' — ', 1)
+            pid = parts[0]
+            rest = parts[1] if len(parts) > 1 else ''
+            prepared.append((pid, rest))
+        return prepared
+
+    prepared_head = _prepare(head)
+    if len(head) >= total:
+        prepared = prepared_head
+    else:
+        def _fill() -> List[Tuple[str, str]]:
+            remainder = sub.drop(index=head.index).sort_values(by=budget_col, ascending=False, kind="stable")
+            return prepared_head + _prepare(remainder)
+        prepared = _LazyRows(prepared_head, total, _fill)
 
     # Store pagination and return first page
-    header = f"Top {min(n_req, len(lines))} projects by approved budget for {target}:"
+    header = f"Top {min(n_req, total)} projects by approved budget for {target}:"
     _set_pagination("contractor", {"contractor": target}, prepared, f"for {target}")
     page_n = min(n_req, 5)
     _PAGINATION_STATE['offset'] = page_n
@@ -505,42 +619,25 @@ def highest_budget_for_contractor(contractor: str) -> str:
     if not contractor or not str(contractor).strip():
         return "Please provide a contractor name."
 
-    contractor_col = find_column(df, [
-        "contractor",
-        "contractor_name",
-        "winning_contractor",
-    ])
-    budget_col = find_column(df, [
-        "approved_budget_num",
-        "approved_budget_for_contract",
-        "approvedbudgetforcontract",
-        "approved_budget",
-        "budget",
-        "contractcost",
-        "approved budget for contract",
-    ])
+    contractor_col = _SCHEMA.get("contractor")
+    budget_col = _SCHEMA.get("budget")
     if contractor_col is None or budget_col is None:
         return "I couldn't find the required columns (contractor/budget)."
 
-    series = df[contractor_col].astype(str)
     target = str(contractor).strip()
-    exact_mask = series.str.strip().str.casefold() == target.casefold()
-    mask = exact_mask | series.str.casefold().str.contains(target.casefold(), na=False)
-    sub = df[mask].copy()
-    if sub.empty:
+    mask = _contractor_mask(df, contractor_col, target)
+    if not mask.any():
         return f"I couldn't find any projects for contractor {target}."
 
-    sub[budget_col] = pd.to_numeric(sub[budget_col], errors="coerce")
-    sub = sub.dropna(subset=[budget_col])
-    if sub.empty:
+    # Work on the matching budget values only; no frame copy is needed
+    budgets = pd.to_numeric(df[budget_col][mask], errors="coerce").to_numpy(dtype=float)
+    if np.isnan(budgets).all():
         return f"No projects with a valid approved budget for contractor {target}."
 
-    row = sub.loc[sub[budget_col].idxmax()]
-    pid_col = find_project_id_column(sub)
-    pid = row.get(pid_col, "N/A")
-    amt = float(row[budget_col]) if pd.notna(row[budget_col]) else None
-    if amt is None:
-        return f"{pid} — Amount not available"
+    pos = int(np.nanargmax(budgets))  # first occurrence of the max, like idxmax
+    pid_col = _SCHEMA.get("project_id")
+    pid = df[pid_col].to_numpy()[mask][pos] if pid_col is not None else "N/A"
+    amt = float(budgets[pos])
     return f"{pid} — ₱{amt:,.2f}"
 
 
@@ -551,14 +648,7 @@ def municipality_max_total(municipality: Optional[str] = None,
                            region: Optional[str] = None) -> str:
     """Which municipality (in a region/area) has the highest total budget."""
     _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = f" in {' ,'.join(where)}" if where else ""
+    place = _build_place(municipality, province, region)
     q = f"which municipality has highest total budget{place}"
     return _agent_answer(q)
 
@@ -575,14 +665,7 @@ def top_projects_by_location_budget(municipality: Optional[str] = None,
     If top_n > 5, uses phrasing that requests all N.
     """
     _require_df()
-    where = []
-    if municipality:
-        where.append(municipality)
-    if province:
-        where.append(province)
-    if region:
-        where.append(_fmt_place_token(region))
-    place = ' ,'.join(where)
+    place = _join_place(municipality, province, region)
     if not place:
         return "Please provide a municipality, province, or region."
     if not top_n or int(top_n) <= 5:
@@ -1,12 +1,20 @@
+import functools
+import logging
 import os
 import re
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from dpwh_web_agent.dpwh_agent.utils.schema import normalize_column
 
+logger = logging.getLogger(__name__)
+
 # Prefer robust, location-independent dataset discovery. Avoid creating directories at import time.
 KAGGLE_FILE = os.environ.get("KAGGLE_FILE", "normalized_dpwh_flood_control_projects.csv")
 
+# Trailing parenthesised province, e.g. 'CONNER (APAYAO)'
+_PAREN_RE = re.compile(r'\s*\(([^)]+)\)\s*$')
+
 def _project_root() -> Path:
     """Return the repository root irrespective of current working directory.
 
@@ -20,8 +28,11 @@ def _project_root() -> Path:
 
 def _candidate_data_dirs() -> list[Path]:
     """Candidate directories to search for dataset files, in priority order."""
+    return list(_candidate_data_dirs_for(os.environ.get("DATA_DIR")))
+
+@functools.lru_cache(maxsize=8)
+def _candidate_data_dirs_for(env_dir: str | None) -> tuple[Path, ...]:
     root = _project_root()
-    env_dir = os.environ.get("DATA_DIR")
     candidates = []
     if env_dir:
         candidates.append(Path(env_dir))
@@ -37,7 +48,15 @@ def _candidate_data_dirs() -> list[Path]:
         if rp not in seen:
             out.append(rp)
             seen.add(rp)
-    return out
+    return tuple(out)
+
+def _dir_entries(d: Path) -> set[str]:
+    """Names in a directory from a single scandir; empty if it cannot be listed."""
+    try:
+        with os.scandir(d) as it:
+            return {e.name for e in it}
+    except OSError:
+        return set()
 
 def _resolve_dataset_path(file_name: str | None) -> Path:
     """Resolve the dataset path by searching likely locations.
@@ -61,11 +80,15 @@ def _resolve_dataset_path(file_name: str | None) -> Path:
 
     checked: list[Path] = []
     for d in _candidate_data_dirs():
+        entries = _dir_entries(d)
         for name in preferred_names:
-            p = (d / name).resolve()
+            p = d / name
             checked.append(p)
-            if p.exists():
-                return p
+            # Plain file names are answered from the listing; nested paths
+            # still need a stat.
+            found = name in entries if Path(name).name == name else p.exists()
+            if found:
+                return p.resolve()
 
     # Nothing found; craft a helpful error message
     msg = [
@@ -81,13 +104,20 @@ def _resolve_dataset_path(file_name: str | None) -> Path:
     raise FileNotFoundError("\n".join(msg))
 
 def _robust_read_csv(path: Path) -> pd.DataFrame:
-    """Robust CSV ingestion with reasonable fallbacks for encoding/bad lines."""
-    # Try utf-8 first
-    try:
-        return pd.read_csv(path, engine="python", on_bad_lines="skip", encoding="utf-8")
-    except Exception:
-        # Fallback to latin-1
-        return pd.read_csv(path, engine="python", on_bad_lines="skip", encoding="latin-1")
+    """Robust CSV ingestion with reasonable fallbacks for encoding/bad lines.
+
+    The C parser is tried first; the much slower python engine is only used
+    if the C parser rejects the file outright.
+    """
+    last_exc: Exception | None = None
+    for engine in ("c", "python"):
+        # Try utf-8 first, then latin-1
+        for encoding in ("utf-8", "latin-1"):
+            try:
+                return pd.read_csv(path, engine=engine, on_bad_lines="skip", encoding=encoding)
+            except Exception as e:
+                last_exc = e
+    raise last_exc
 
 def clean_municipality_value(value):
     """
@@ -97,9 +127,75 @@ def clean_municipality_value(value):
         return value
     
     # Convert parentheses to comma format
-    cleaned = re.sub(r'\s*\(([^)]+)\)\s*$', r', \1', value)
+    cleaned = _PAREN_RE.sub(r', \1', value)
     return cleaned.strip()
 
+# Low-cardinality text columns that every ranking/filter path groups or matches on
+CATEGORY_COLUMNS = (
+    "main_island",
+    "region",
+    "province",
+    "legislative_district",
+    "municipality",
+    "district_engineering_office",
+    "type_of_work",
+    "contractor",
+)
+
+def _compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store the location/contractor text columns as pandas categoricals."""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype("category")
+    return df
+
+def _clean_municipality_column(series: pd.Series) -> pd.Series:
+    """Apply clean_municipality_value once per distinct value, not once per row."""
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return series
+    cleaned = np.array([clean_municipality_value(v) for v in uniques], dtype=object)
+    # codes == -1 marks missing values, which are kept as-is
+    values = np.where(codes >= 0, cleaned[codes], series.to_numpy())
+    return pd.Series(values, index=series.index, name=series.name)
+
+def _parquet_cache_path(path: Path) -> Path:
+    """Parquet sibling of the normalized CSV for a resolved dataset path."""
+    name = path.name if path.name.startswith("normalized_") else "normalized_" + path.name
+    return (path.parent / name).with_suffix(".parquet")
+
+def _is_fresh(cache: Path, source: Path) -> bool:
+    try:
+        return cache.stat().st_mtime >= source.stat().st_mtime
+    except OSError:
+        return False
+
+def _write_parquet_cache(df: pd.DataFrame, csv_path: Path, parquet_path: Path) -> Path:
+    """Snapshot the normalized frame written to csv_path as Parquet.
+
+    Returns the CSV path if the snapshot cannot be written.
+    """
+    try:
+        _compact_dtypes(df.copy()).to_parquet(parquet_path, compression="zstd", index=False)
+    except Exception:
+        logger.exception("Could not write Parquet cache %s; using %s", parquet_path, csv_path)
+        return csv_path
+    return parquet_path
+
+def load_dataset(path: Path) -> pd.DataFrame:
+    """Load the dataset returned by agent1_run (Parquet or CSV)."""
+    path = Path(path)
+    if path.suffix.lower() != ".parquet":
+        return _compact_dtypes(pd.read_csv(path))
+    df = pd.read_parquet(path)
+    # Parquet round-trips missing strings as None; restore the NaN that
+    # read_csv produces so string comparisons behave the same.
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object and s.isna().any():
+            df[col] = s.where(s.notna(), np.nan)
+    return _compact_dtypes(df)
+
 def agent1_run(file_name: str = None) -> Path:
     """
     Load data from local data directory.
@@ -108,12 +204,18 @@ def agent1_run(file_name: str = None) -> Path:
         file_name: Name of the CSV file to load (default: cleaned_dpwh_flood_control_projects.csv)
     
     Returns:
-        Path: Path to the loaded CSV file
+        Path: Path to the normalized dataset, a Parquet snapshot when one can be
+        written, otherwise the CSV. Load it with load_dataset().
     """
     # Resolve dataset path from multiple likely locations
     file_name = file_name or KAGGLE_FILE
     path = _resolve_dataset_path(file_name)
 
+    # A Parquet snapshot at least as new as the source skips all re-normalization
+    parquet_path = _parquet_cache_path(path)
+    if _is_fresh(parquet_path, path):
+        return parquet_path
+
     # Load dataset robustly
     df = _robust_read_csv(path)
 
@@ -140,19 +242,20 @@ def agent1_run(file_name: str = None) -> Path:
     
     # Apply municipality cleaning if needed
     if 'municipality' in df.columns:
-        has_parentheses = df['municipality'].astype(str).str.contains(r'\(', na=False).any()
+        muni = df['municipality']
+        has_parentheses = muni.astype(str).str.contains('(', regex=False, na=False).any()
         if has_parentheses:
-            df['municipality'] = df['municipality'].apply(clean_municipality_value)
+            df['municipality'] = _clean_municipality_column(muni)
 
     # If the discovered path is already a normalized file, return it directly to avoid re-writing
     if path.name.startswith("normalized_"):
-        return path
+        return _write_parquet_cache(df, path, parquet_path)
 
     # Otherwise, write a normalized CSV alongside the discovered dataset file
     normalized_path = path.parent / ("normalized_" + path.name)
     normalized_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(normalized_path, index=False)
-    return normalized_path
+    return _write_parquet_cache(df, normalized_path, parquet_path)
 
 
 # For testing
@@ -1,29 +1,124 @@
-from typing import Dict, Optional, Any, List, Tuple
+from typing import Dict, Optional, Any, Callable, Iterable, List, Sequence, Tuple
+import bisect
+import functools
 import os
+import numpy as np
 import pandas as pd
 import re
-import unicodedata
+import weakref
 from dpwh_web_agent.dpwh_agent.utils.schema import find_column
-from dpwh_web_agent.dpwh_agent.utils.text import display_municipality as _display_municipality, normalize_lgu_text as _normalize_lgu_text
+from dpwh_web_agent.dpwh_agent.utils.text import display_municipality as _display_municipality, normalize_lgu_text as _normalize_lgu_text, normalize_lgu_series as _normalize_lgu_series
 from dpwh_web_agent.dpwh_agent.shared import format_money
-
-ROMAN_MAP = {
-    "1": "i", "2": "ii", "3": "iii", "4": "iv", "5": "v",
-    "6": "vi", "7": "vii", "8": "viii", "9": "ix", "10": "x",
-    "11": "xi", "12": "xii", "13": "xiii", "14": "xiv", "15": "xv",
-    "16": "xvi", "17": "xvii", "18": "xviii"
-}
+from dpwh_web_agent.dpwh_agent.agents.agent3_text import (
+    ROMAN_MAP,
+    _region_patterns,
+    _RE_REGION_IVAB,
+    _RE_NCR,
+    _RE_CAR,
+    _RE_DAVAO,
+    _RE_DAVAO_CITY,
+    _RE_DAVAO_PROVINCE,
+    _RE_DAVAO_REGION,
+    _RE_REGION_NUM,
+    _RE_NAMED_CITY,
+    _RE_IN_LOCATIONS,
+    _RE_LOCATION_SEP,
+    _copy_filters,
+    _parse_top_n,
+    _parse_time_filters,
+    _RE_PARSE_HINTS,
+    _RE_TOP_BUDGET_FOR,
+    _RE_LIST_TOP_BUDGET_FOR,
+    _RE_HIGHEST_BUDGET,
+    _RE_WHO_CONTRACTOR_MAX_BUDGET,
+    _RE_WHICH_CONTRACTOR_MAX_BUDGET,
+    _RE_LIST_ALL_PROJECTS,
+    _RE_GIVE_ALL_IN,
+    _RE_GIVE_ALL_N,
+    _RE_N_MORE,
+    _RE_COUNT_CONTRACTOR_HAVE,
+    _RE_TRAILING_IN,
+    _RE_TOP_CONTRACTORS_BUDGET,
+    _RE_TOP_CONTRACTORS_COUNT,
+    _RE_MOST_PROJECTS,
+    _RE_WHO_CONTRACTOR_MOST,
+    _RE_HIGHEST_PROJECTS,
+    _RE_MUNI_MAX,
+    _RE_PROJECT_ID,
+    _RE_FIELD_LOOKUP_HINT,
+    _RE_CONTRACTOR_LOOKUP,
+    _RE_BUDGET_LOOKUP,
+    _RE_START_LOOKUP,
+    _RE_COMPLETION_LOOKUP,
+    _RE_LOCATION_LOOKUP,
+    _RE_DETAIL_LOOKUP,
+    _RE_NON_NUMERIC,
+    _RE_ONLY_SIGNS,
+    _RE_NUMERIC_SUBSTRING,
+    _RE_FULL_PID,
+    _RE_COUNT_CONTRACTOR_PATTERNS,
+    _RE_CONTRACTOR_FILLER,
+    _RE_HIGHEST_KW,
+    _RE_LOWEST_KW,
+    _RE_TOTAL_KW,
+    _AFFIRMATIONS,
+    _MORE_REQUESTS,
+)
 
 # ---------- Column resolution utilities are provided by utils.schema.find_column
 
+# Candidate column names shared by the answer branches
+_CONTRACTOR_CANDIDATES = ("contractor", "contractor_name", "winning_contractor")
+_BUDGET_CANDIDATES = (
+    "approved_budget_num",
+    "approved_budget_for_contract",
+    "approvedbudgetforcontract",
+    "approved_budget",
+    "budget",
+    "contractcost",
+    "approved budget for contract",
+)
+_BUDGET_NUM_CANDIDATES = ("approved_budget_num", "approvedbudgetforcontract", "approved_budget", "budget", "contractcost")
+_MUNICIPALITY_CANDIDATES = ("municipality", "city")
+
+
 _PAGINATION_STATE: Dict[str, Any] = {
     "mode": None,              # 'location' | 'contractor' | None
     "filters": None,           # filters dict used to build the list
     "rows": None,              # List of tuples in display order. Rows may be (project_id, contractor) or (project_id, contractor, budget)
     "offset": 0,               # how many already shown
     "header_ctx": "",          # cached header context text
+    "seq": 0,                  # bumped whenever the pagination state is set or read
 }
 
+class _LazyRows(Sequence):
+    """Pagination rows whose first page(s) are ready and the rest built on demand.
+
+    ``head`` must be the leading rows of what ``fill()`` returns; ``fill`` is
+    only called when a slice reaches past the head.
+    """
+
+    def __init__(self, head: List[Tuple[Any, ...]], total: int, fill: Callable[[], List[Tuple[Any, ...]]]):
+        self._head = head
+        self._total = total
+        self._fill = fill
+        self._rows: Optional[List[Tuple[Any, ...]]] = None
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, i):
+        if self._rows is None:
+            if isinstance(i, slice):
+                start, stop, step = i.indices(self._total)
+                if step == 1 and stop <= len(self._head):
+                    return self._head[i]
+            elif 0 <= i < len(self._head):
+                return self._head[i]
+            self._rows = self._fill()
+        return self._rows[i]
+
+
 def _set_pagination(mode: str, filters: dict, rows: List[Tuple[str, str, Any]] | List[Tuple[str, str]], header_ctx: str) -> None:
     _PAGINATION_STATE.update({
         "mode": mode,
@@ -31,9 +126,26 @@ def _set_pagination(mode: str, filters: dict, rows: List[Tuple[str, str, Any]] |
         "rows": rows,
         "offset": 0,
         "header_ctx": header_ctx,
+        "seq": int(_PAGINATION_STATE.get("seq") or 0) + 1,
     })
 
+def _fmt_page_row(item: Any) -> str:
+    # item may be (pid, contractor) or (pid, contractor, budget)
+    try:
+        size = len(item)
+    except TypeError:
+        return str(item)
+    if size >= 3:
+        amt = item[2]
+        if isinstance(amt, (int, float)):
+            return f"- {item[0]} — {item[1]} — {format_money(amt)}"
+        return f"- {item[0]} — {item[1]}"
+    if size == 2:
+        return f"- {item[0]} — {item[1]}"
+    return f"- {item}"
+
 def _consume_more(count: int = 5) -> Optional[str]:
+    _PAGINATION_STATE["seq"] = int(_PAGINATION_STATE.get("seq") or 0) + 1
     rows = _PAGINATION_STATE.get("rows") or []
     off = int(_PAGINATION_STATE.get("offset") or 0)
     if not rows or off >= len(rows):
@@ -41,274 +153,385 @@ def _consume_more(count: int = 5) -> Optional[str]:
     n = max(1, int(count))
     take = rows[off: off + n]
     _PAGINATION_STATE["offset"] = off + len(take)
-    lines = []
-    for item in take:
-        # item may be (pid, contractor) or (pid, contractor, budget)
-        try:
-            if len(item) >= 3:
-                pid, contr, amt = item[0], item[1], item[2]
-                if amt is not None and isinstance(amt, (int, float)):
-                    lines.append(f"- {pid} — {contr} — {format_money(float(amt))}")
-                else:
-                    lines.append(f"- {pid} — {contr}")
-            elif len(item) == 2:
-                pid, contr = item
-                lines.append(f"- {pid} — {contr}")
-            else:
-                lines.append(f"- {item}")
-        except Exception:
-            lines.append(str(item))
+    lines = [_fmt_page_row(item) for item in take]
     remaining = len(rows) - _PAGINATION_STATE["offset"]
     tail = f"\n\nWould you like 5 more projects?" if remaining > 0 else ""
     prefix = f"More projects{(' ' + _PAGINATION_STATE['header_ctx']) if _PAGINATION_STATE.get('header_ctx') else ''}:\n"
     return prefix + ("\n".join(lines)) + tail
 
 
+# Per-DataFrame derived state, dropped when the frame is garbage collected
+_DF_CACHE: Dict[int, Dict[str, Any]] = {}
+
+def _df_cache(df: pd.DataFrame) -> Dict[str, Any]:
+    key = id(df)
+    cache = _DF_CACHE.get(key)
+    if cache is None:
+        cache = _DF_CACHE[key] = {}
+        weakref.finalize(df, _DF_CACHE.pop, key, None)
+    return cache
+
+def _derived(df: pd.DataFrame, key: Tuple[str, str], build: Callable[[], Any]) -> Any:
+    cache = _df_cache(df)
+    series = cache.get(key)
+    if series is None:
+        series = cache[key] = build()
+    return series
+
+def _text_codes(df: pd.DataFrame, col: str, strip: bool = False) -> Tuple[np.ndarray, pd.Index]:
+    """Integer codes into the distinct lowercased texts of df[col].astype(str), built once per DataFrame.
+
+    Categorical columns reuse their own codes; other columns are factorized.
+    """
+    cache = _df_cache(df)
+    key = ("text_codes", col, strip)
+    entry = cache.get(key)
+    if entry is None:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            cats = s.cat.categories
+            codes = s.cat.codes.to_numpy()
+            # Missing values read as the string "nan", like astype(str)
+            codes = np.where(codes < 0, len(cats), codes)
+            texts = pd.Index(list(cats.astype(str)) + ["nan"], dtype=object)
+        else:
+            codes, texts = pd.factorize(s.astype(str))
+            texts = pd.Index(texts, dtype=object)
+        if strip:
+            texts = texts.str.strip()
+        entry = cache[key] = (codes, texts.str.lower())
+    return entry
+
+def _text_mask(df: pd.DataFrame, col: str, predicate: Callable[[pd.Index], Any], strip: bool = False) -> np.ndarray:
+    """Row mask from a predicate evaluated once per distinct lowercased text of df[col]."""
+    codes, texts = _text_codes(df, col, strip)
+    hits = np.asarray(predicate(texts), dtype=bool)
+    return hits[codes]
+
+def _to_datetime(df: pd.DataFrame, col: str) -> pd.Series:
+    """pd.to_datetime(df[col], errors='coerce'), computed once per DataFrame."""
+    return _derived(df, ("datetime", col), lambda: pd.to_datetime(df[col], errors='coerce'))
+
+def _dt_year(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Calendar year of _to_datetime(df, col) as int16, 0 where the date is missing."""
+    return _derived(df, ("year", col), lambda: _to_datetime(df, col).dt.year.fillna(0).to_numpy(dtype=np.int16))
+
+def _numeric_for(df: pd.DataFrame, sub: pd.DataFrame, col: str) -> pd.Series:
+    """pd.to_numeric(sub[col], errors='coerce') for a row subset of df, read from df's coercion computed once."""
+    if not df.index.is_unique:
+        return pd.to_numeric(sub[col], errors='coerce')
+    full = _derived(df, ("numeric", col), lambda: pd.to_numeric(df[col], errors='coerce'))
+    return full if sub is df else full.reindex(sub.index)
+
+def _budget_order(budget: pd.Series, limit: Optional[int] = None) -> np.ndarray:
+    """Positions of the non-missing budgets, largest first with ties in row order.
+
+    With ``limit`` only the leading positions are selected, without sorting
+    the whole column.
+    """
+    values = budget.to_numpy(dtype=float, na_value=np.nan)
+    pos = np.flatnonzero(~np.isnan(values))
+    if limit is not None and limit < len(pos):
+        return pos[pd.Series(values[pos]).nlargest(limit).index.to_numpy()]
+    return pos[np.argsort(-values[pos], kind="stable")]
+
+def _is_string_column(df: pd.DataFrame, col: str) -> bool:
+    """pd.api.types.is_string_dtype(df[col]) as it was before the column became categorical.
+
+    An object column only counts when every value is a string, so a
+    categorical with missing values does not count either.
+    """
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return len(s) == 0 or (s.cat.categories.inferred_type == "string" and not s.hasnans)
+    return pd.api.types.is_string_dtype(s)
+
+def _narrow(keep: Optional[np.ndarray], mask: Any) -> np.ndarray:
+    """AND a row mask into keep as a plain bool array."""
+    mask = np.asarray(mask, dtype=bool)
+    return mask if keep is None else keep & mask
+
+def _project_row(df: pd.DataFrame, col: str, pid: str) -> Optional[pd.Series]:
+    """First row whose lowercased project id equals pid, via an index built once per DataFrame."""
+    cache = _df_cache(df)
+    key = ("pid_index", col)
+    index = cache.get(key)
+    if index is None:
+        lowered = df[col].astype(str).str.lower().to_numpy()
+        # Built back to front so duplicate ids keep their first position
+        index = cache[key] = dict(zip(lowered[::-1].tolist(), range(len(lowered) - 1, -1, -1)))
+    i = index.get(pid)
+    return None if i is None else df.iloc[i]
+
+def _text_vocab(df: pd.DataFrame, col: str) -> Dict[str, Any]:
+    """Distinct non-null values of a column with their lowercased text, built once per DataFrame.
+
+    The lowered texts are also joined into one NUL-separated blob so a substring
+    search is a single str.find plus a bisect back to the owning value.
+    """
+    cache = _df_cache(df)
+    key = ("vocab", col)
+    vocab = cache.get(key)
+    if vocab is None:
+        values = list(df[col].dropna().unique())
+        lowered = [str(v).lower() for v in values]
+        starts, pos = [], 0
+        for text in lowered:
+            starts.append(pos)
+            pos += len(text) + 1
+        blob = None if any("\0" in text for text in lowered) else "\0".join(lowered)
+        vocab = cache[key] = {"values": values, "lowered": lowered, "blob": blob, "starts": starts}
+    return vocab
+
+def _normalized_values(df: pd.DataFrame, col: str) -> Tuple[List[str], List[str]]:
+    """Distinct non-null values of a column as strings, with their normalize_lgu_text forms, built once per DataFrame."""
+    cache = _df_cache(df)
+    key = ("lgu_norm_values", col)
+    entry = cache.get(key)
+    if entry is None:
+        vals = df[col].dropna().astype(str).unique().tolist()
+        entry = cache[key] = (vals, _normalize_lgu_series(pd.Series(vals, dtype=object)).tolist())
+    return entry
+
+def _first_containing(vocab: Dict[str, Any], needle: str) -> Any:
+    """First vocabulary value whose lowercased text contains needle, or None."""
+    blob = vocab["blob"]
+    if blob is not None and "\0" not in needle:
+        # The earliest hit in the blob lies in the earliest value containing needle
+        pos = blob.find(needle)
+        return vocab["values"][bisect.bisect_right(vocab["starts"], pos) - 1] if pos >= 0 else None
+    for value, lowered in zip(vocab["values"], vocab["lowered"]):
+        if needle in lowered:
+            return value
+    return None
 
-def _today_year() -> int:
-    try:
-        return pd.Timestamp.today().year
-    except Exception:
-        return  pd.Timestamp.now().year
+def _location_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    """Location columns detect_filters consults, resolved once per DataFrame."""
+    cache = _df_cache(df)
+    cols = cache.get("location_columns")
+    if cols is None:
+        cols = cache["location_columns"] = {
+            "main_island": find_column(df, ["main_island", "mainisland", "main island"]),
+            "municipality": find_column(df, _MUNICIPALITY_CANDIDATES),
+            "province": find_column(df, ["province"]),
+            # The multi-location check only accepts a literal municipality column
+            "municipality_strict": find_column(df, ["municipality"]),
+            "project_location": find_column(df, ["project_location", "location", "site_location"]),
+        }
+    return cols
+
+def _lgu_index(df: pd.DataFrame) -> Dict[str, Any]:
+    """Municipality/province vocabularies used by detect_filters, built once per DataFrame."""
+    cache = _df_cache(df)
+    index = cache.get("lgu")
+    if index is not None:
+        return index
+    index = {"muni_by_lower": None, "norm_map": None, "prov_norm_map": None, "locations": None}
+    cols = _location_columns(df)
+    muni_col = cols["municipality"]
+    if muni_col is not None:
+        # Shares the normalized names with the not-found suggestions
+        municipalities, norms = _normalized_values(df, muni_col)
+        # Normalized lookup: longest names first to avoid partial collisions
+        norm_map = []  # list of tuples (norm_name, tokens, canonical)
+        for muni, norm in zip(municipalities, norms):
+            if norm:
+                tokens = [t for t in norm.split() if len(t) >= 5]
+                norm_map.append((norm, tokens, muni.strip()))
+        norm_map.sort(key=lambda x: len(x[0]), reverse=True)
+        # Exact "<Name> City" lookups: stripped lowercase name -> first such value
+        muni_by_lower: Dict[str, str] = {}
+        for muni in municipalities:
+            if muni:
+                muni_by_lower.setdefault(muni.strip().lower(), muni)
+        index["muni_by_lower"] = muni_by_lower
+        index["norm_map"] = norm_map
+        index["muni_phrases"] = _phrase_index(norm for norm, _, _ in norm_map)
+        # Significant token -> first position in norm_map that contains it
+        token_ranks: Dict[str, int] = {}
+        for i, (_, tokens, _) in enumerate(norm_map):
+            for t in tokens:
+                token_ranks.setdefault(t, i)
+        index["muni_token_ranks"] = token_ranks
+    province_col = cols["province"]
+    if province_col is not None:
+        provinces = df[province_col].dropna().astype(str).unique()
+        prov_norms = _normalize_lgu_series(pd.Series(provinces, dtype=object))
+        index["prov_norm_map"] = sorted(zip(prov_norms, provinces), key=lambda x: len(x[0]), reverse=True)
+        index["prov_phrases"] = _phrase_index(norm for norm, _ in index["prov_norm_map"])
+    project_loc_col = cols["project_location"]
+    if project_loc_col is not None:
+        locations = sorted(df[project_loc_col].dropna().astype(str).unique(), key=len, reverse=True)
+        index["locations"] = [(loc.lower(), loc) for loc in locations]
+    cache["lgu"] = index
+    return index
+
+def _phrase_index(norms: Iterable[str]) -> Tuple[Dict[str, int], Tuple[int, ...]]:
+    """Map each normalized phrase to its first position, plus the distinct phrase lengths in words."""
+    ranks: Dict[str, int] = {}
+    for i, norm in enumerate(norms):
+        if norm:
+            ranks.setdefault(norm, i)
+    return ranks, tuple(sorted({norm.count(" ") + 1 for norm in ranks}))
+
+def _best_phrase(phrases: Tuple[Dict[str, int], Tuple[int, ...]], tokens: List[str]) -> Optional[int]:
+    """Lowest position of an indexed phrase that occurs as whole words in tokens, or None.
+
+    Equivalent to trying rf"\b{phrase}\b" for each phrase in order, since normalized
+    text is single-spaced [a-z0-9].
+    """
+    ranks, lengths = phrases
+    best = None
+    for n in lengths:
+        for i in range(len(tokens) - n + 1):
+            rank = ranks.get(" ".join(tokens[i:i + n]))
+            if rank is not None and (best is None or rank < best):
+                best = rank
+    return best
+
+def _match_province(lgu: Dict[str, Any], p_words: List[str]) -> Optional[str]:
+    """Longest province name appearing as a whole phrase in the normalized prompt."""
+    if lgu["prov_norm_map"] is None:
+        return None
+    rank = _best_phrase(lgu["prov_phrases"], p_words)
+    return lgu["prov_norm_map"][rank][1] if rank is not None else None
 
 def detect_filters(prompt: str, df: pd.DataFrame) -> Dict[str, Any]:
     """Detect filters (region/province/municipality/island/project_location) from user prompt."""
+    memo = _df_cache(df).setdefault("filters", {})
+    filters = memo.get(prompt)
+    if filters is None:
+        if len(memo) >= 256:
+            memo.clear()
+        filters = memo[prompt] = _detect_filters(prompt, df)
+    return _copy_filters(filters)
+
+def _detect_filters(prompt: str, df: pd.DataFrame) -> Dict[str, Any]:
     p = prompt.lower()
-    
-    def _normalize_text(s: str) -> str:
-        """Lowercase, remove accents/diacritics, collapse spaces and drop generic prefixes like 'city of'."""
-        if not isinstance(s, str):
-            return ""
-        # remove accents
-        s_norm = unicodedata.normalize('NFKD', s)
-        s_ascii = s_norm.encode('ascii', 'ignore').decode('ascii')
-        s_ascii = s_ascii.lower()
-        # remove common prefixes and stopwords around LGUs
-        s_ascii = re.sub(r"\b(city of|municipality of|municipality|city)\b", " ", s_ascii)
-        # keep letters, numbers and spaces
-        s_ascii = re.sub(r"[^a-z0-9\s\-]", " ", s_ascii)
-        s_ascii = re.sub(r"[\-]", " ", s_ascii)
-        s_ascii = re.sub(r"\s+", " ", s_ascii).strip()
-        return s_ascii
-
-    p_norm = _normalize_text(prompt)
     filters: Dict[str, Any] = {}
+    cols = _location_columns(df)
 
     # Region IV-A / IV-B pattern
-    m = re.search(r"region\s*(?:iv-?|4)?\s*[–-]?\s*([ab])", p)
+    m = _RE_REGION_IVAB.search(p)
     if m:
         subregion = m.group(1).lower()
         filters["region"] = "iv-a" if subregion == 'a' else "iv-b"
         return filters
 
     # NCR pattern (check FIRST before other patterns)
-    if re.search(r"\bncr\b|national capital region|metro manila|ncr", p):
+    if _RE_NCR.search(p):
         filters["region"] = "National Capital Region"
         return filters
     
     # Cordillera pattern (check FIRST before other patterns)  
-    if re.search(r"\bcar\b|cordillera|cordillera administrative region|car", p):
+    if _RE_CAR.search(p):
         filters["region"] = "Cordillera Administrative Region"
         return filters
 
     # Davao region / city / provinces handling (common ambiguous user input 'Davao')
-    if re.search(r"\bdavao\b", p):
+    if _RE_DAVAO.search(p):
         # Explicit city mention -> municipality
-        if re.search(r"\bdavao\s*,?\s*city\b|\bdavao\s+city\b", p):
+        if _RE_DAVAO_CITY.search(p):
             filters["municipality"] = "Davao City"
             return filters
         # Province forms like 'Davao del Norte', 'Davao del Sur', 'Davao de Oro', 'Davao Occidental'
-        mprov = re.search(r"davao\s+(del\s+norte|del\s+sur|de\s+oro|occidental|oriental)", p)
+        mprov = _RE_DAVAO_PROVINCE.search(p)
         if mprov:
             prov = mprov.group(0).strip()
             filters["province"] = prov.title()
             return filters
         # Region or plain 'Davao' -> assume Davao Region (Region XI)
-        if re.search(r"davao region|region\s*(xi|11)", p) or ("davao" in p and ("region" in p or "," not in prompt)):
+        if _RE_DAVAO_REGION.search(p) or ("davao" in p and ("region" in p or "," not in prompt)):
             filters["region"] = "Davao Region"
             return filters
 
     # Standard region pattern (handles both roman and numeric)
-    m = re.search(r"region\s*([0-9ivx]+)", p)
+    m = _RE_REGION_NUM.search(p)
     if m:
         region_str = m.group(1).lower()
         filters["region"] = region_str  # Store what user typed - apply_filters handles matching
         return filters
 
     # Island keywords
-    main_island_col = find_column(df, ["main_island", "mainisland", "main island"])
+    main_island_col = cols["main_island"]
     for island in ["luzon", "visayas", "mindanao"]:
         if island in p and main_island_col is not None:
             filters["main_island"] = island
             return filters
 
     # Municipality detection (diacritic-insensitive; allow prompts like "paranaque" to match "CITY OF PARAÑAQUE")
-    muni_col = find_column(df, ["municipality", "city"])
-    if muni_col is not None:
-        municipalities = df[muni_col].dropna().astype(str).unique()
-        m_city = re.search(r"\b([a-zA-Z][a-zA-Z\s\.'\-&]{1,60})\s*,?\s*city\b", prompt, flags=re.I)
+    # Normalized prompt words, shared by every municipality/province lookup below
+    p_words = _normalize_lgu_text(prompt).split()
+    lgu = _lgu_index(df)
+    if lgu["muni_by_lower"] is not None:
+        m_city = _RE_NAMED_CITY.search(prompt)
         if m_city:
             candidate_name = m_city.group(1).strip()
             candidate_full = f"{candidate_name} City"
-            for muni in municipalities:
-                if muni and muni.strip().lower() == candidate_full.strip().lower():
-                    filters["municipality"] = muni
-                    # attempt to capture province if present in the prompt
-                    province_col = find_column(df, ["province"])
-                    if province_col is not None:
-                        provinces = df[province_col].dropna().astype(str).unique()
-                        prov_norm_map = sorted(((_normalize_text(prov), prov) for prov in provinces), key=lambda x: len(x[0]), reverse=True)
-                        p_norm = _normalize_text(prompt)
-                        for prov_norm, prov_canon in prov_norm_map:
-                            if prov_norm and re.search(rf"\b{re.escape(prov_norm)}\b", p_norm):
-                                filters["province"] = prov_canon
-                                break
-                    return filters
-        # Build normalized lookup: longest names first to avoid partial collisions
-        norm_map = []  # list of tuples (norm_name, tokens, canonical)
-        for muni in municipalities:
-            canon = muni.strip()
-            norm = _normalize_text(canon)
-            if norm:
-                tokens = [t for t in norm.split() if len(t) >= 5]
-                norm_map.append((norm, tokens, canon))
-        norm_map.sort(key=lambda x: len(x[0]), reverse=True)
-
-        # 1) prefer full normalized phrase match
-        for norm, tokens, canon in norm_map:
-            if re.search(rf"\b{re.escape(norm)}\b", p_norm):
-                filters["municipality"] = canon
-                province_col = find_column(df, ["province"])
-                if province_col is not None:
-                    provinces = df[province_col].dropna().astype(str).unique()
-                    prov_norm_map = sorted((( _normalize_text(prov), prov) for prov in provinces), key=lambda x: len(x[0]), reverse=True)
-                    for prov_norm, prov_canon in prov_norm_map:
-                        if prov_norm and re.search(rf"\b{re.escape(prov_norm)}\b", p_norm):
-                            filters["province"] = prov_canon
-                            break
+            muni = lgu["muni_by_lower"].get(candidate_full.strip().lower())
+            if muni is not None:
+                filters["municipality"] = muni
+                # attempt to capture province if present in the prompt
+                prov = _match_province(lgu, p_words)
+                if prov is not None:
+                    filters["province"] = prov
                 return filters
+        norm_map = lgu["norm_map"]
+
+        # 1) prefer full normalized phrase match (longest name wins)
+        rank = _best_phrase(lgu["muni_phrases"], p_words)
+        if rank is not None:
+            filters["municipality"] = norm_map[rank][2]
+            prov = _match_province(lgu, p_words)
+            if prov is not None:
+                filters["province"] = prov
+            return filters
 
         # 2) token-based match (e.g., 'paranaque' within 'paranaque metropolitan manila')
-        p_tokens = set(p_norm.split())
-        for norm, tokens, canon in norm_map:
-            if any(t in p_tokens for t in tokens):
-                filters["municipality"] = canon
-                province_col = find_column(df, ["province"])
-                if province_col is not None:
-                    provinces = df[province_col].dropna().astype(str).unique()
-                    prov_norm_map = sorted((( _normalize_text(prov), prov) for prov in provinces), key=lambda x: len(x[0]), reverse=True)
-                    for prov_norm, prov_canon in prov_norm_map:
-                        if prov_norm and re.search(rf"\b{re.escape(prov_norm)}\b", p_norm):
-                            filters["province"] = prov_canon
-                            break
-                return filters
+        token_ranks = lgu["muni_token_ranks"]
+        hits = [token_ranks[t] for t in set(p_words) if t in token_ranks]
+        if hits:
+            filters["municipality"] = norm_map[min(hits)][2]
+            prov = _match_province(lgu, p_words)
+            if prov is not None:
+                filters["province"] = prov
+            return filters
 
     # Multi-location in municipality/province: "in Pasig or Quezon City" / "in Laguna and Cavite"
     # Capture tokens after 'in' split by 'or/and,/'
-    m_multi = re.search(r"\bin\s+([a-z\s,\/]+)(?:\?|$)", p)
-    if m_multi and (find_column(df, ["municipality"]) or find_column(df, ["province"])):
+    m_multi = _RE_IN_LOCATIONS.search(p)
+    if m_multi and (cols["municipality_strict"] or cols["province"]):
         raw = m_multi.group(1)
-        items = [it.strip() for it in re.split(r"\s*(?:,|\/|\band\b|\bor\b)\s*", raw) if it.strip()]
+        items = [it.strip() for it in _RE_LOCATION_SEP.split(raw) if it.strip()]
         if items:
             filters["multi_locations"] = items
 
     # Province detection (if no municipality) – also diacritic-insensitive
     if not filters:
-        province_col = find_column(df, ["province"])
-        if province_col is not None:
-            provinces = df[province_col].dropna().astype(str).unique()
-            prov_norm_map = sorted((( _normalize_text(prov), prov) for prov in provinces), key=lambda x: len(x[0]), reverse=True)
-            for prov_norm, prov_canon in prov_norm_map:
-                if prov_norm and re.search(rf"\b{re.escape(prov_norm)}\b", p_norm):
-                    filters["province"] = prov_canon
-                    return filters
+        prov = _match_province(lgu, p_words)
+        if prov is not None:
+            filters["province"] = prov
+            return filters
 
     # Fallback: project_location
-    project_loc_col = find_column(df, ["project_location", "location", "site_location"])
-    if project_loc_col is not None:
-        locations = sorted(df[project_loc_col].dropna().astype(str).unique(), key=len, reverse=True)
-        for loc in locations:
-            if loc.lower() in p:
-                filters["project_location"] = loc
-                return filters
+    for loc_lower, loc in lgu["locations"] or ():
+        if loc_lower in p:
+            filters["project_location"] = loc
+            return filters
 
     return filters
 
 
-def _parse_top_n(prompt: str) -> Optional[int]:
-    m = re.search(r"\btop\s+(\d{1,3})\b", prompt.lower())
-    if m:
-        try:
-            n = int(m.group(1))
-            return n if n > 0 else None
-        except Exception:
-            return None
-    return None
-
-def _parse_time_filters(prompt: str) -> Dict[str, Any]:
-    p = prompt.lower()
-    t: Dict[str, Any] = {}
-    # Year range: between 2021 and 2023
-    m = re.search(r"between\s+(\d{4})\s+and\s+(\d{4})", p)
-    if m:
-        a, b = int(m.group(1)), int(m.group(2))
-        t["year_range"] = (min(a,b), max(a,b))
-        return t
-    # Year range with hyphen or 'to', e.g. '2021-2023' or '2021 to 2023'
-    m = re.search(r"(\d{2,4})\s*(?:-|–|—|to)\s*(\d{2,4})", p)
-    if m:
-        a, b = int(m.group(1)), int(m.group(2))
-        # normalize two-digit years to 2000s
-        if a < 100:
-            a += 2000
-        if b < 100:
-            b += (a // 100) * 100
-        t["year_range"] = (min(a,b), max(a,b))
-        return t
-    # Comma or space separated list of years: '2020,2021' or '2020 2021'
-    nums = re.findall(r"\d{2,4}", p)
-    if len(nums) >= 2:
-        years = []
-        for n in nums:
-            y = int(n)
-            if y < 100:
-                y += 2000
-            years.append(y)
-        # unique and sorted
-        years = sorted(list(dict.fromkeys(years)))
-        t["years"] = years
-        return t
-    # Single year: in 2023 / for 2024
-    m = re.search(r"\b(in|for)\s+(\d{4})\b", p)
-    if m:
-        t["year"] = int(m.group(2))
-    # Completed in YEAR
-    m = re.search(r"completed\s+in\s+(\d{4})", p)
-    if m:
-        t["completed_year"] = int(m.group(1))
-    # Relative years
-    if "last year" in p:
-        t["year"] = _today_year() - 1
-    if "this year" in p:
-        t["year"] = _today_year()
-    # Status keywords
-    if re.search(r"\bongoing\b", p):
-        t["status"] = "ongoing"
-    if re.search(r"\bcompleted\b", p) and "completed_year" not in t:
-        t["status"] = "completed"
-    return t
-
-
-
 def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
     p = prompt.lower()
+    hints = frozenset(_RE_PARSE_HINTS.findall(p))
 
     # 🔎 PRIORITY ORDER: Check statistical queries FIRST before project ID detection
 
     # Top N projects with highest approved budget for a contractor
-    m_contractor_top = (
-        re.search(r"top\s+\d+\s+(?:with\s+the\s+)?(?:highest\s+)?(?:approved\s+)?budget\s+(?:of|for|by)\s+(.+)$", p)
-        or re.search(r"list\s+the\s+top\s+(\d+)\s+(?:with\s+the\s+)?(?:highest\s+)?(?:approved\s+)?budget\s+(?:of|for|by)\s+(.+)$", p)
+    m_contractor_top = ("top" in hints and "budget" in hints) and (
+        _RE_TOP_BUDGET_FOR.search(p)
+        or _RE_LIST_TOP_BUDGET_FOR.search(p)
     )
     if m_contractor_top:
         # Extract top_n and contractor name
@@ -320,17 +543,15 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
             contractor_query = ""
         contractor_query = contractor_query.rstrip('. ,;!?')
         # Try to resolve contractor name against dataset
-        contractor_col = find_column(df, ['contractor', 'contractor_name', 'winning_contractor'])
+        contractor_col = find_column(df, _CONTRACTOR_CANDIDATES)
         filters = {}
         if contractor_col:
-            candidates = df[contractor_col].dropna().astype(str).unique()
             best = None
             cq = contractor_query.lower()
-            for c in candidates:
-                cs = str(c)
-                cl = cs.lower()
+            vocab = _text_vocab(df, contractor_col)
+            for c, cl in zip(vocab["values"], vocab["lowered"]):
                 if cq and (cq in cl or cl in cq):
-                    best = cs
+                    best = str(c)
                     break
             if best:
                 filters['contractor'] = best
@@ -338,26 +559,24 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
         return {"action": "top_projects_by_contractor_budget", "filters": filters, "column": "approved_budget_num", "top_n": top_n, "time": time_filters}
 
     # Contractor with highest total/approved budget (single winner) - CHECK BEFORE generic highest budget
-    if (
-        ("contractor" in p and re.search(r"highest\s+(?:total\s+)?(?:approved\s+)?budget", p))
-        or re.search(r"who\s+(?:is\s+)?the\s+contractor\s+with\s+(?:the\s+)?highest\s+(?:total\s+)?(?:approved\s+)?budget", p)
-        or re.search(r"which\s+contractor\s+(?:has|with)\s+(?:the\s+)?highest\s+(?:total\s+)?(?:approved\s+)?budget", p)
+    if ("contractor" in hints and "budget" in hints) and (
+        ("contractor" in p and _RE_HIGHEST_BUDGET.search(p))
+        or _RE_WHO_CONTRACTOR_MAX_BUDGET.search(p)
+        or _RE_WHICH_CONTRACTOR_MAX_BUDGET.search(p)
     ):
         filters = detect_filters(prompt, df)
         time_filters = _parse_time_filters(prompt)
         return {"action": "contractor_max_total_budget", "filters": filters, "column": "approved_budget_num", "time": time_filters}
 
     # Highest budget pattern - CHECK FIRST
-    highest_keywords: list[str] = ["highest approved budget", "max approved budget", "highest budget", "max budget", "largest budget", "biggest budget"]
-    if any(keyword in p for keyword in highest_keywords):
+    if "budget" in hints and _RE_HIGHEST_KW.search(p):
         filters = detect_filters(prompt, df)
         top_n = _parse_top_n(prompt) or 1
         time_filters = _parse_time_filters(prompt)
         return {"action": "max", "column": "approved_budget_num", "filters": filters, "top_n": top_n, "time": time_filters}
     
     # Lowest budget pattern
-    lowest_keywords: list[str] = ["lowest approved budget", "min approved budget", "minimum approved budget", "lowest budget", "minimum budget", "least budget"]
-    if any(keyword in p for keyword in lowest_keywords):
+    if "budget" in hints and _RE_LOWEST_KW.search(p):
         filters = detect_filters(prompt, df)
         top_n = _parse_top_n(prompt) or 1
         time_filters = _parse_time_filters(prompt)
@@ -365,13 +584,13 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
 
     # List projects by location – interpret as "top 5 by highest approved budget in <place>"
     # Also accept: "give me all <N> projects in <place>"
-    if ("list" in p and "project" in p and "in" in p) or re.search(r"list all .*projects", p) or re.search(r"give me all\s+\d+\s+projects\s+in", p):
+    if ("list" in hints or "give me all" in hints) and (("list" in p and "project" in p and "in" in p) or _RE_LIST_ALL_PROJECTS.search(p) or _RE_GIVE_ALL_IN.search(p)):
         filters = detect_filters(prompt, df)
         # trigger only if we found a location-like filter
         if any(k in filters for k in ("municipality", "province", "region", "project_location")):
             time_filters = _parse_time_filters(prompt)
             # Default top_n=5 and cap later in renderer unless explicit number appears after 'all'
-            m_alln = re.search(r"give me all\s+(\d+)\s+projects", p)
+            m_alln = _RE_GIVE_ALL_N.search(p)
             if m_alln:
                 try:
                     return {"action": "top_projects_by_location_budget", "filters": filters, "column": "approved_budget_num", "top_n": int(m_alln.group(1)), "force_all": True, "time": time_filters}
@@ -380,19 +599,20 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
             return {"action": "top_projects_by_location_budget", "filters": filters, "column": "approved_budget_num", "top_n": 5, "time": time_filters}
 
     # Follow-ups for pagination
-    if re.fullmatch(r"\s*(yes|yeah|yep|sure|ok|okay|please)\s*", p):
+    p_stripped = p.strip()
+    if p_stripped in _AFFIRMATIONS:
         return {"action": "more_projects", "count": 5, "filters": {}}
     # Plain 'more' or 'show more' should also map to pagination follow-up
-    if p.strip() in {"more", "more projects", "show more", "5 more", "5 more projects"}:
+    if p_stripped in _MORE_REQUESTS:
         return {"action": "more_projects", "count": 5, "filters": {}}
-    m_more = re.search(r"(\d+)\s+more\s+projects?", p)
+    m_more = _RE_N_MORE.search(p)
     if m_more:
         try:
             return {"action": "more_projects", "count": int(m_more.group(1))}
         except Exception:
             return {"action": "more_projects", "count": 5}
     # "give me all 9 projects" without restating location – use pagination state
-    m_all_total = re.search(r"give me all\s+(\d+)\s+projects", p)
+    m_all_total = "give me all" in hints and _RE_GIVE_ALL_N.search(p)
     if m_all_total and not any(kw in p for kw in ["in "]):
         try:
             return {"action": "more_projects", "count": int(m_all_total.group(1))}
@@ -400,48 +620,35 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
             return {"action": "more_projects", "count": 5}
 
     # Count pattern - CHECK THIRD (Enhanced with contractor-specific logic)
-    if "how many" in p or p.startswith("how many"):
+    if "how many" in hints:
         filters = detect_filters(prompt, df)
 
         # Special handling for contractor queries
         if "contractor" in p and not filters:
             # Direct pattern: "how many projects contractor <NAME> have"
-            direct_match = re.search(r"how many projects\s+contractor\s+(.+?)\s+have\b", p)
+            direct_match = _RE_COUNT_CONTRACTOR_HAVE.search(p)
             if direct_match:
                 contractor_name = direct_match.group(1).strip().rstrip('.,;:!?')
-                contractor_col = find_column(df, ['contractor', 'contractor_name', 'winning_contractor'])
+                contractor_col = find_column(df, _CONTRACTOR_CANDIDATES)
                 if contractor_col:
-                    contractors = df[contractor_col].dropna().unique()
-                    for contractor in contractors:
-                        if pd.notna(contractor) and contractor_name.lower() in str(contractor).lower():
-                            filters = {"contractor": contractor}
-                            break
+                    contractor = _first_containing(_text_vocab(df, contractor_col), contractor_name.lower())
+                    if contractor is not None:
+                        filters = {"contractor": contractor}
             
             # Enhanced patterns to catch more variations
-            contractor_patterns = [
-                r"how many projects.*contractor.*have\s+(.+)$",
-                r"how many projects.*does\s+(.+?)\s+have",
-                r"how many projects.*by\s+(.+)$",
-                r"how many projects.*from\s+(.+)$",
-                r"how many projects\s+(.+?)\s+(?:does|do)\s+have",  # ✅ NEW: "projects X does have"
-                r"contractor\s+have\s+(.+?)(?:\?|$)",  # ✅ NEW: "contractor have X"
-            ]
-            
-            for pattern in contractor_patterns:
-                match = re.search(pattern, p)
+            for pattern in _RE_COUNT_CONTRACTOR_PATTERNS:
+                match = pattern.search(p)
                 if match:
                     contractor_name = match.group(1).strip()
                     # Clean up the contractor name (remove common words and punctuation)
-                    contractor_name = re.sub(r'\b(contractor|company|corp|inc|ltd|does|have)\b', '', contractor_name, flags=re.IGNORECASE).strip()
+                    contractor_name = _RE_CONTRACTOR_FILLER.sub('', contractor_name).strip()
                     contractor_name = contractor_name.rstrip('.,;:!?')  # ✅ Remove trailing punctuation
                     
                     # Find matching contractor in the dataset
                     if "contractor" in df.columns:
-                        contractors = df["contractor"].dropna().unique()
-                        for contractor in contractors:
-                            if pd.notna(contractor) and contractor_name.lower() in str(contractor).lower():
-                                filters = {"contractor": contractor}
-                                break
+                        contractor = _first_containing(_text_vocab(df, "contractor"), contractor_name.lower())
+                        if contractor is not None:
+                            filters = {"contractor": contractor}
                     break
         
         # ✅ NEW: Fallback - if still no filters but contractor name appears in prompt
@@ -462,17 +669,15 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
                     if potential_name:
                         contractor_name = ' '.join(potential_name)
                         # Search in dataset
-                        contractors = df["contractor"].dropna().unique()
-                        for contractor in contractors:
-                            if pd.notna(contractor) and contractor_name.lower() in str(contractor).lower():
-                                filters = {"contractor": contractor}
-                                break
+                        contractor = _first_containing(_text_vocab(df, "contractor"), contractor_name.lower())
+                        if contractor is not None:
+                            filters = {"contractor": contractor}
                         if filters:
                             break
 
         # Always capture "in X" as filter (even if detect_filters misses it)
         if not filters:
-            m2 = re.search(r"in\s+([a-z\s\-]+)$", p)
+            m2 = _RE_TRAILING_IN.search(p)
             if m2:
                 place = m2.group(1).strip()
                 filters = {"project_location": place}
@@ -481,43 +686,42 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
         return {"action": "count", "filters": filters, "column": None, "time": time_filters}
 
     # Top contractors by total budget (prioritize before generic sum)
-    if re.search(r"top\s+\d+\s+contractors\s+by\s+(?:total\s+)?budget", p):
+    if "top" in hints and "budget" in hints and _RE_TOP_CONTRACTORS_BUDGET.search(p):
         filters = detect_filters(prompt, df)
         time_filters = _parse_time_filters(prompt)
         top_n = _parse_top_n(prompt) or 5
         return {"action": "top_contractors", "filters": filters, "column": "approved_budget_num", "top_n": top_n, "time": time_filters}
 
     # Top contractors by number of projects
-    if re.search(r"top\s+\d+\s+contractors\s+by\s+(?:number\s+of\s+projects|project\s+count|projects)", p):
+    if "top" in hints and "contractor" in hints and _RE_TOP_CONTRACTORS_COUNT.search(p):
         filters = detect_filters(prompt, df)
         time_filters = _parse_time_filters(prompt)
         top_n = _parse_top_n(prompt) or 10
         return {"action": "top_contractors_by_count", "filters": filters, "column": None, "top_n": top_n, "time": time_filters}
 
     # Contractor with highest number of projects (single winner)
-    if (
-        re.search(r"which\s+contractor\s+(?:has|with)\s+(?:the\s+)?(?:most|highest|largest)\s+(?:number\s+of\s+)?projects?", p)
-        or re.search(r"who\s+is\s+the\s+contractor\s+with\s+(?:the\s+)?(?:most|highest|largest)\s+(?:number\s+of\s+)?projects?", p)
-        or ("contractor" in p and re.search(r"highest\s+number\s+of\s+projects?", p))
+    if "contractor" in hints and (
+        _RE_MOST_PROJECTS.search(p)
+        or _RE_WHO_CONTRACTOR_MOST.search(p)
+        or ("contractor" in p and _RE_HIGHEST_PROJECTS.search(p))
     ):
         filters = detect_filters(prompt, df)
         time_filters = _parse_time_filters(prompt)
         return {"action": "contractor_max_count", "filters": filters, "column": None, "time": time_filters}
 
     # Total budget pattern - CHECK SECOND
-    total_keywords: list[str] = ["total budget", "sum", "overall budget","cost","total cost","total approved budget"]
-    if any(keyword in p for keyword in total_keywords):
+    if ("budget" in hints or "sum" in hints or "cost" in hints) and _RE_TOTAL_KW.search(p):
         filters = detect_filters(prompt, df)
         time_filters = _parse_time_filters(prompt)
         return {"action": "sum", "column": "approved_budget_num", "filters": filters, "time": time_filters}
 
     # Trend by year
-    if re.search(r"(trend|by year|per year)", p) and ("total" in p or "budget" in p):
+    if ("trend" in hints or "by year" in hints or "per year" in hints) and ("total" in p or "budget" in p):
         filters = detect_filters(prompt, df)
         return {"action": "trend_by_year", "filters": filters, "column": "approved_budget_num"}
 
     # Comparative queries: which municipality in X has highest total budget
-    if re.search(r"which\s+municipality.*highest\s+total\s+budget", p):
+    if "municipality" in hints and _RE_MUNI_MAX.search(p):
         filters = detect_filters(prompt, df)
         time_filters = _parse_time_filters(prompt)
         return {"action": "municipality_max_total", "filters": filters, "column": "approved_budget_num", "time": time_filters}
@@ -525,61 +729,77 @@ def simple_parse(prompt: str, df: pd.DataFrame) -> dict:
     # NOW check for project ID patterns (after statistical queries)
     
     # First check for explicit "project id" pattern
-    m = re.search(r"(project\s*id|projectid)\s*([a-z0-9\-]+)", p)
+    m = _RE_PROJECT_ID.search(p)
     if m:
         return {"action": "lookup", "filters": {"project_id": m.group(2)}, "column": None}
     
     # Check for specific field queries about projects (NEW FEATURE)
-    # Who is the contractor of [project_id]
-    contractor_match = re.search(r"who is the contractor.*?([a-z][a-z0-9\-]{5,19})(?:\s|$)", p)
-    if contractor_match:
-        return {"action": "contractor_lookup", "filters": {"project_id": contractor_match.group(1)}, "column": None}
+    # Every field query below needs one of these phrases; skip them all otherwise
+    if _RE_FIELD_LOOKUP_HINT.search(p):
+        # Who is the contractor of [project_id]
+        contractor_match = _RE_CONTRACTOR_LOOKUP.search(p)
+        if contractor_match:
+            return {"action": "contractor_lookup", "filters": {"project_id": contractor_match.group(1)}, "column": None}
     
-    # What is the budget of [project_id] 
-    budget_match = re.search(r"what is the budget.*?([a-z][a-z0-9\-]{5,19})(?:\s|$)", p)
-    if budget_match:
-        return {"action": "budget_lookup", "filters": {"project_id": budget_match.group(1)}, "column": None}
+        # What is the budget of [project_id] 
+        budget_match = _RE_BUDGET_LOOKUP.search(p)
+        if budget_match:
+            return {"action": "budget_lookup", "filters": {"project_id": budget_match.group(1)}, "column": None}
     
-    # When did [project_id] start
-    start_match = re.search(r"when did.*?([a-z][a-z0-9\-]{5,19}).*start", p)
-    if start_match:
-        return {"action": "start_date_lookup", "filters": {"project_id": start_match.group(1)}, "column": None}
+        # When did [project_id] start
+        start_match = _RE_START_LOOKUP.search(p)
+        if start_match:
+            return {"action": "start_date_lookup", "filters": {"project_id": start_match.group(1)}, "column": None}
     
-    # When was [project_id] completed
-    completion_match = re.search(r"when.*?([a-z][a-z0-9\-]{5,19}).*(complet|finish)", p)
-    if completion_match:
-        return {"action": "completion_lookup", "filters": {"project_id": completion_match.group(1)}, "column": None}
+        # When was [project_id] completed
+        completion_match = _RE_COMPLETION_LOOKUP.search(p)
+        if completion_match:
+            return {"action": "completion_lookup", "filters": {"project_id": completion_match.group(1)}, "column": None}
     
-    # Where is [project_id] / What is the location of [project_id]
-    location_match = re.search(r"(where is|what is the location).*?([a-z][a-z0-9\-]{5,19})(?:\s|$)", p)
-    if location_match:
-        return {"action": "location_lookup", "filters": {"project_id": location_match.group(2)}, "column": None}
+        # Where is [project_id] / What is the location of [project_id]
+        location_match = _RE_LOCATION_LOOKUP.search(p)
+        if location_match:
+            return {"action": "location_lookup", "filters": {"project_id": location_match.group(2)}, "column": None}
     
-    # Check for questions about specific project details (FALLBACK - full info)
-    detail_match = re.search(r"(what is the cost|who is the consultant|what is the status).*?([a-z][a-z0-9\-]{5,19})(?:\s|$)", p)
-    if detail_match:
-        return {"action": "lookup", "filters": {"project_id": detail_match.group(2)}, "column": None}
+        # Check for questions about specific project details (FALLBACK - full info)
+        detail_match = _RE_DETAIL_LOOKUP.search(p)
+        if detail_match:
+            return {"action": "lookup", "filters": {"project_id": detail_match.group(2)}, "column": None}
     
     # Check if the entire prompt looks like a project ID (common patterns)
-    project_id_pattern = re.match(r"^([a-z0-9\-]{6,20})$", p.strip())
+    project_id_pattern = _RE_FULL_PID.match(p.strip())
     if project_id_pattern:
         return {"action": "lookup", "filters": {"project_id": project_id_pattern.group(1)}, "column": None}
 
     return {"action": "unknown", "filters": {}}
 
 
+_NCR_ALIASES = frozenset({"national capital region", "ncr", "metro manila", "metropolitan manila"})
+_RE_NCR_ALIAS = re.compile("|".join(map(re.escape, sorted(_NCR_ALIASES))))
+
 def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
-    out = df
+    keep = _filter_mask(df, filters)
+    return df if keep is None else df[keep]
+
+
+def _filter_mask(df: pd.DataFrame, filters: dict) -> Optional[np.ndarray]:
+    """Row mask over df for apply_filters, or None when no filter applies.
+
+    Every filter is evaluated against the full frame's cached lowered columns
+    and the masks are AND-ed, which selects the same rows as narrowing the
+    frame filter by filter.
+    """
+    keep = None
     if not filters:
-        return out
+        return keep
 
     # Resolve common columns in a case-insensitive way
-    region_col = find_column(out, ["region"])
-    main_island_col = find_column(out, ["main_island", "mainisland", "main island"])
-    municipality_col = find_column(out, ["municipality", "city"])
-    province_col = find_column(out, ["province"])
-    project_loc_col = find_column(out, ["project_location", "location", "site_location"])
-    contractor_col = find_column(out, ["contractor", "contractor_name", "winning_contractor"])
+    region_col = find_column(df, ["region"])
+    main_island_col = find_column(df, ["main_island", "mainisland", "main island"])
+    municipality_col = find_column(df, _MUNICIPALITY_CANDIDATES)
+    province_col = find_column(df, ["province"])
+    project_loc_col = find_column(df, ["project_location", "location", "site_location"])
+    contractor_col = find_column(df, _CONTRACTOR_CANDIDATES)
 
     # Multi-location support (municipality/province lists)
     multi_locs = filters.get("multi_locations")
@@ -588,10 +808,12 @@ def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
         muni_col = municipality_col
         prov_col = province_col
         candidates_norm = [str(x).strip().lower() for x in multi_locs]
+        # Any candidate as a substring, as one escaped alternation
+        candidates_re = re.compile("|".join(map(re.escape, candidates_norm)))
         if muni_col is not None:
-            out = out[out[muni_col].astype(str).str.lower().apply(lambda x: any(c in x for c in candidates_norm))]
+            keep = _narrow(keep, _text_mask(df, muni_col, lambda texts: texts.str.contains(candidates_re)))
         elif prov_col is not None:
-            out = out[out[prov_col].astype(str).str.lower().apply(lambda x: any(c in x for c in candidates_norm))]
+            keep = _narrow(keep, _text_mask(df, prov_col, lambda texts: texts.str.contains(candidates_re)))
 
     for k, v in filters.items():
         if v is None:
@@ -599,75 +821,34 @@ def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
 
         if k == "region" and region_col is not None:
             pat = v.lower()
-            patterns = []
-            
-            # If input is a digit (e.g., "2" or "3"), convert to roman and add "region" prefix
-            if pat.isdigit():
-                roman = ROMAN_MAP.get(pat, pat)
-                patterns.extend([
-                    f"region {roman}",      # "region ii"
-                    f"region {pat}",         # "region 2"
-                ])
-            # If input is already roman (e.g., "ii" or "iii")
-            elif pat in ROMAN_MAP.values():
-                patterns.extend([
-                    f"region {pat}",         # "region ii"
-                ])
-            else:
-                patterns.append(pat)
-            
-            # Special handling for Region 4/IV
-            if pat in ['4', 'iv']:
-                patterns.extend([
-                    'region iv-a', 'region iv-b',
-                    'region 4-a', 'region 4-b',
-                    'calabarzon', 'mimaropa'
-                ])
-            
-            if pat in ['4a', 'iv-a']:
-                patterns.extend(['region iv-a', 'region 4-a', 'calabarzon'])
-            if pat in ['4b', 'iv-b']:
-                patterns.extend(['region iv-b', 'region 4-b', 'mimaropa'])
+            patterns = _region_patterns(pat)
             
             # Build mask with EXACT matching after "region " prefix
-            # Start with an all-False boolean Series to avoid scalar-bool indexing errors when no patterns match
-            mask = pd.Series(False, index=out.index)
-            for p in patterns:
-                # Use word boundary or exact space matching to prevent partial matches
-                region_vals = out[region_col].astype(str).str.lower()
-                if p.startswith('region '):
-                    # Use startswith to allow suffixes like "(Cagayan Valley)" or extra descriptors
-                    current_mask = region_vals.str.startswith(p)
-                else:
-                    current_mask = region_vals == p
-                mask = mask | current_mask
+            # Use startswith to allow suffixes like "(Cagayan Valley)" or extra descriptors
+            prefix_patterns = tuple(p for p in patterns if p.startswith('region '))
+            exact_patterns = [p for p in patterns if not p.startswith('region ')]
+            mask = _text_mask(
+                df, region_col,
+                lambda texts: texts.isin(exact_patterns) | (texts.str.startswith(prefix_patterns) if prefix_patterns else False),
+            )
 
             # NCR alias support: also match province and DEO text for Metro Manila synonyms
-            ncr_aliases = {"national capital region", "ncr", "metro manila", "metropolitan manila"}
-            if pat in ncr_aliases:
+            if pat in _NCR_ALIASES:
                 # Province-based matching (common for Metro Manila rows)
                 if province_col is not None:
-                    prov_vals = out[province_col].astype(str).str.lower()
-                    prov_mask = pd.Series(False, index=out.index)
-                    for alias in ncr_aliases:
-                        prov_mask = prov_mask | prov_vals.str.contains(alias, na=False)
-                    mask = mask | prov_mask
+                    mask |= _text_mask(df, province_col, lambda texts: texts.str.contains(_RE_NCR_ALIAS))
                 # District Engineering Office sometimes contains Metro Manila
-                deo_col = find_column(out, ["district_engineering_office", "district engineering office"]) 
+                deo_col = find_column(df, ["district_engineering_office", "district engineering office"]) 
                 if deo_col is not None:
-                    deo_vals = out[deo_col].astype(str).str.lower()
-                    deo_mask = pd.Series(False, index=out.index)
-                    for alias in ncr_aliases:
-                        deo_mask = deo_mask | deo_vals.str.contains(alias, na=False)
-                    mask = mask | deo_mask
+                    mask |= _text_mask(df, deo_col, lambda texts: texts.str.contains(_RE_NCR_ALIAS))
 
-            out = out[mask]
+            keep = _narrow(keep, mask)
             
         elif k == "main_island" and main_island_col is not None:
-            mask = out[main_island_col].astype(str).str.lower() == v.lower()
-            out = out[mask]
+            island = v.lower()
+            keep = _narrow(keep, _text_mask(df, main_island_col, lambda texts: texts == island))
 
-        elif k in out.columns or (k in ["municipality", "province", "project_location", "contractor"]):
+        elif k in df.columns or (k in ["municipality", "province", "project_location", "contractor"]):
             # map to actual column
             col = None
             if k == "municipality":
@@ -678,95 +859,144 @@ def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
                 col = project_loc_col
             elif k == "contractor":
                 col = contractor_col
-            if col is None and k in out.columns:
+            if col is None and k in df.columns:
                 col = k
 
             if col is None:
                 continue
 
-            if pd.api.types.is_string_dtype(out[col]):
-                mask = out[col].astype(str).str.strip().str.lower() == v.lower()
+            if _is_string_column(df, col):
+                needle = v.lower()
+                mask = _text_mask(df, col, lambda texts: texts == needle, strip=True)
                 
-                if not mask.any():
-                    mask = out[col].astype(str).str.lower().str.contains(v.lower(), na=False)
+                # Substring fallback only when nothing left in the selection matches exactly
+                if not _narrow(keep, mask).any():
+                    mask = _text_mask(df, col, lambda texts: texts.str.contains(needle, regex=False))
                 
-                out = out[mask]
+                keep = _narrow(keep, mask)
             else:
-                out = out[out[col] == v]
+                keep = _narrow(keep, df[col] == v)
 
-    return out
+    return keep
 
 
 def _apply_time_filters(df: pd.DataFrame, time_spec: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    keep = _time_mask(df, time_spec)
+    return df if keep is None else df[keep]
+
+
+def _time_mask(df: pd.DataFrame, time_spec: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+    """Row mask over df for _apply_time_filters, or None when no time filter applies."""
+    keep = None
     if not time_spec:
-        return df
-    out = df
+        return keep
     # Prefer parsed dates where available
-    start_col = find_column(out, ["start_date_parsed", "startdate_parsed"]) or find_column(out, ["start_date", "startdate"]) 
-    comp_col  = find_column(out, ["completion_date_parsed", "actualcompletiondate_parsed"]) or find_column(out, ["completion_date", "actual_completion_date", "actualcompletiondate"]) 
-    year_col  = find_column(out, ["funding_year", "year"])  # backup when dates missing
+    start_col = find_column(df, ["start_date_parsed", "startdate_parsed"]) or find_column(df, ["start_date", "startdate"]) 
+    comp_col  = find_column(df, ["completion_date_parsed", "actualcompletiondate_parsed"]) or find_column(df, ["completion_date", "actual_completion_date", "actualcompletiondate"]) 
+    year_col  = find_column(df, ["funding_year", "year"])  # backup when dates missing
 
     # Completed in a specific year
     if "completed_year" in time_spec and comp_col is not None:
         year = int(time_spec["completed_year"])
-        out = out[pd.to_datetime(out[comp_col], errors='coerce').dt.year == year]
+        keep = _narrow(keep, _dt_year(df, comp_col) == year)
 
     # Single year
     if "year" in time_spec:
         y = int(time_spec["year"])
         if start_col is not None:
-            out = out[pd.to_datetime(out[start_col], errors='coerce').dt.year == y]
+            keep = _narrow(keep, _dt_year(df, start_col) == y)
         elif year_col is not None:
-            out = out[out[year_col].astype(str) == str(y)]
+            keep = _narrow(keep, df[year_col].astype(str) == str(y))
 
     # Multiple explicit years (list)
     if "years" in time_spec:
         years = [int(x) for x in time_spec["years"]]
         if start_col is not None:
-            ys = pd.to_datetime(out[start_col], errors='coerce').dt.year
-            out = out[ys.isin(years)]
+            keep = _narrow(keep, np.isin(_dt_year(df, start_col), years))
         elif year_col is not None:
-            ys = pd.to_numeric(out[year_col], errors='coerce')
-            out = out[ys.isin(years)]
+            ys = pd.to_numeric(df[year_col], errors='coerce')
+            keep = _narrow(keep, ys.isin(years))
 
     # Year range
     if "year_range" in time_spec:
         a, b = time_spec["year_range"]
         if start_col is not None:
-            ys = pd.to_datetime(out[start_col], errors='coerce').dt.year
-            out = out[(ys >= a) & (ys <= b)]
+            ys = _dt_year(df, start_col)
+            keep = _narrow(keep, (ys >= a) & (ys <= b))
         elif year_col is not None:
-            ys = pd.to_numeric(out[year_col], errors='coerce')
-            out = out[(ys >= a) & (ys <= b)]
+            ys = pd.to_numeric(df[year_col], errors='coerce')
+            keep = _narrow(keep, (ys >= a) & (ys <= b))
 
     # Status filters
     if time_spec.get("status") == "ongoing" and comp_col is not None:
-        comp = pd.to_datetime(out[comp_col], errors='coerce')
-        out = out[comp.isna() | (comp > pd.Timestamp.today())]
+        comp = _to_datetime(df, comp_col)
+        keep = _narrow(keep, comp.isna() | (comp > pd.Timestamp.today()))
     if time_spec.get("status") == "completed" and comp_col is not None:
-        comp = pd.to_datetime(out[comp_col], errors='coerce')
-        out = out[comp.notna() & (comp <= pd.Timestamp.today())]
-    return out
+        comp = _to_datetime(df, comp_col)
+        keep = _narrow(keep, comp.notna() & (comp <= pd.Timestamp.today()))
+    return keep
 
 
 def find_project_id_column(df: pd.DataFrame) -> str:
     """Find the correct project ID column name in the DataFrame."""
+    return _project_id_column(tuple(df.columns))
+
+@functools.lru_cache(maxsize=64)
+def _project_id_column(columns: Tuple[Any, ...]) -> Optional[str]:
     possible_names = [
         'projectid', 'project_id', 'ProjectID', 'Project_ID', 
         'project_number', 'projectnumber', 'id', 'ID'
     ]
     
     for name in possible_names:
-        if name in df.columns:
+        if name in columns:
             return name
     
     # If none found, return the first column that might contain project IDs
-    for col in df.columns:
+    for col in columns:
         if 'project' in col.lower() and 'id' in col.lower():
             return col
     
     # Last resort: return first column
-    return df.columns[0] if len(df.columns) > 0 else None
+    return columns[0] if columns else None
+
+
+# Full project lookup: display fields and the column names each may come from
+_LOOKUP_FIELDS = (
+    ("Project Title", ('project_title', 'title', 'project_name', 'name', 'projecttitle')),
+    ("Description", ('description', 'project_description', 'scope', 'project_scope')),
+    ("Approved Budget", ('approvedbudgetforcontract', 'approved_budget', 'budget', 'approved_budget_num')),
+    ("Contract Amount", ('contract_amount', 'contractamount', 'contract_cost')),
+    ("Location", ('legislativedistrict', 'location', 'project_location', 'district')),
+    ("Municipality", ('municipality', 'city', 'municipal')),
+    ("Province", ('province', 'provincial')),
+    ("Region", ('region', 'regions')),
+    ("Contractor", ('contractor', 'contractor_name', 'contractorname', 'winning_contractor')),
+    ("Consultant", ('consultant', 'consultant_name', 'consultantname')),
+    ("Start Date", ('startdate', 'start_date', 'datestarted', 'commencement_date', 'contract_start')),
+    ("Target Completion", ('targetcompletiondate', 'target_completion', 'planned_completion', 'contract_end')),
+    ("Actual Completion", ('actualcompletiondate', 'actual_completion', 'datecompleted', 'completion_date')),
+    ("Project Status", ('status', 'project_status', 'current_status')),
+    ("Progress", ('progress', 'percent_complete', 'completion_percentage')),
+    ("Fund Source", ('fund_source', 'funding_source', 'source_of_fund')),
+    ("Implementing Office", ('implementing_office', 'office', 'implementing_unit')),
+    ("Project Type", ('project_type', 'type', 'category')),
+)
+_LOOKUP_COVERED = frozenset(col for _, cols in _LOOKUP_FIELDS for col in cols)
+
+@functools.lru_cache(maxsize=64)
+def _lookup_layout(columns: Tuple[Any, ...], project_id_col: str) -> Tuple[Tuple[Tuple[str, Any], ...], Tuple[Any, ...]]:
+    """(display name, column) for each lookup field present, and the columns left for the extra section."""
+    present = set(columns)
+    fields = []
+    for display_name, possible_columns in _LOOKUP_FIELDS:
+        # The first matching column wins, even if this row has no value there
+        col = next((c for c in possible_columns if c in present), None)
+        if col is not None:
+            fields.append((display_name, col))
+    covered = _LOOKUP_COVERED | {project_id_col}  # Also exclude the project ID column
+    extra = tuple(col for col in columns if col.lower() not in covered)
+    return tuple(fields), extra
 
 
 REQUIRE_CONFIRM = str(os.environ.get("REQUIRE_CONFIRM", "0")).lower() in {"1", "true", "yes", "on"}
@@ -826,6 +1056,79 @@ def _clarify_message(parsed: dict, df: pd.DataFrame) -> str:
     return "Clarification needed: " + " ".join(parts) + f"{where}{when}.\n" + "\n".join(questions)
 
 
+def _ctx_parts(filters: dict, dedupe_province: bool = False) -> List[str]:
+    """Display names of the municipality, province and region filters, in that order.
+
+    With ``dedupe_province`` the province is left out when the municipality
+    display already names it.
+    """
+    muni_disp = _display_municipality(filters['municipality']) if 'municipality' in filters else None
+    prov_disp = str(filters['province']) if 'province' in filters else None
+    if dedupe_province:
+        if prov_disp and muni_disp and prov_disp.lower() in muni_disp.lower():
+            prov_disp = None
+        muni_disp, prov_disp = muni_disp or None, prov_disp or None
+    ctx = [part for part in (muni_disp, prov_disp) if part is not None]
+    if 'region' in filters:
+        ctx.append(f"Region {filters['region']}")
+    return ctx
+
+def _place_parts(filters: dict) -> List[str]:
+    """'municipality of ...', 'province of ...', region, island and location filters as sentence parts."""
+    parts: List[str] = []
+    if "municipality" in filters:
+        parts.append(f"municipality of {filters['municipality']}")
+    if "province" in filters:
+        parts.append(f"province of {filters['province']}")
+    if "region" in filters:
+        parts.append(f"Region {filters['region']}")
+    if "main_island" in filters:
+        parts.append(filters['main_island'])
+    if "project_location" in filters:
+        parts.append(filters['project_location'])
+    return parts
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of a filters/time dict, keeping key order (filters apply in order)."""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _filtered_agg(df: pd.DataFrame, key: Tuple[Any, ...], build: Callable[[], pd.Series]) -> pd.Series:
+    """Aggregate over a filtered view of df, memoized per DataFrame by filter signature."""
+    memo = _df_cache(df).setdefault("aggs", {})
+    value = memo.get(key)
+    if value is None:
+        if len(memo) >= 256:
+            memo.clear()
+        value = memo[key] = build()
+    return value
+
+def _contractor_totals(df: pd.DataFrame, sub: pd.DataFrame, agg_key: Tuple[Any, ...], contractor_col: str, budget_col: str) -> pd.Series:
+    """Total numeric budget per contractor in sub, largest first."""
+    def build() -> pd.Series:
+        budget = _numeric_for(df, sub, budget_col)
+        return budget.groupby(sub[contractor_col], dropna=True, observed=True).sum().sort_values(ascending=False)
+    return _filtered_agg(df, agg_key + ("contractor_totals", contractor_col, budget_col), build)
+
+def _contractor_counts(df: pd.DataFrame, sub: pd.DataFrame, agg_key: Tuple[Any, ...], contractor_col: str) -> pd.Series:
+    """Project count per contractor in sub, most first."""
+    def build() -> pd.Series:
+        return (
+            sub.dropna(subset=[contractor_col])
+              .groupby(contractor_col, dropna=True, observed=True)
+              .size()
+              .sort_values(ascending=False)
+        )
+    return _filtered_agg(df, agg_key + ("contractor_counts", contractor_col), build)
+
+
+_LOOKUP_ACTIONS = frozenset({
+    "lookup", "contractor_lookup", "budget_lookup", "start_date_lookup", "completion_lookup", "location_lookup",
+})
+
 def agent3_run(question: str, df: pd.DataFrame) -> str:
     parsed = simple_parse(question, df)
     action = parsed["action"]
@@ -836,8 +1139,18 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
     if REQUIRE_CONFIRM:
         return _clarify_message(parsed, df)
 
-    sub = apply_filters(df, filters)
-    sub = _apply_time_filters(sub, time_spec)
+    # Project-id lookups and pagination follow-ups never read the filtered frame
+    if action == "more_projects" or (action in _LOOKUP_ACTIONS and "project_id" in filters):
+        sub = df
+    else:
+        # Both masks come from the full frame's cached columns, then one slice
+        keep = _filter_mask(df, filters)
+        time_keep = _time_mask(df, time_spec)
+        if time_keep is not None:
+            keep = _narrow(keep, time_keep)
+        sub = df if keep is None else df[keep]
+    # Identifies sub across requests; status filters compare against today's date
+    agg_key = (_freeze(filters), _freeze(time_spec), pd.Timestamp.today().date())
 
     # Handle specific field lookups (NEW FEATURE)
     if action in ["contractor_lookup", "budget_lookup", "start_date_lookup", "completion_lookup", "location_lookup"] and "project_id" in filters:
@@ -850,13 +1163,11 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
             return "I couldn't find a project ID column in the dataset."
         
         # Search for the project
-        project = df[df[project_id_col].astype(str).str.lower() == pid]
+        row = _project_row(df, project_id_col, pid)
 
-        if project.empty:
+        if row is None:
             return f"I couldn't find any project with ID {pid.upper()}."
 
-        row = project.iloc[0]
-
         # Return specific field information
         if action == "contractor_lookup":
             contractor_cols = ['contractor', 'contractor_name', 'contractorname', 'winning_contractor']
@@ -881,10 +1192,10 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
 
                     # Try to parse numeric from string (remove currency symbols/commas)
                     s = str(value)
-                    num_s = re.sub(r"[^0-9.\-]", "", s)
+                    num_s = _RE_NON_NUMERIC.sub("", s)
                     try:
                         # Avoid empty or just '-' strings
-                        if num_s and not re.fullmatch(r"[\.-]+", num_s):
+                        if num_s and not _RE_ONLY_SIGNS.fullmatch(num_s):
                             num = float(num_s)
                             return f"The approved budget for Project ID {pid.upper()} is {format_money(num)} (parsed from column '{col}')."
                     except Exception:
@@ -895,20 +1206,15 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
 
             # As a fallback, search all columns for numeric substrings and return the largest candidate found
             numeric_candidates = []  # list of (col, numeric_value)
-            for col in df.columns:
+            for col, val in row.items():
                 try:
-                    val = row.get(col)
                     if pd.isna(val):
                         continue
-                    s = str(val)
                     # find numbers like 1,234,567.89 or 1234567.89
-                    found_nums = re.findall(r"[0-9]{1,3}(?:[,0-9]{0,})?(?:\.[0-9]+)?|[0-9]+(?:\.[0-9]+)?", s)
-                    for n in found_nums:
-                        n_clean = n.replace(',', '')
+                    for n in _RE_NUMERIC_SUBSTRING.findall(str(val)):
                         try:
-                            fnum = float(n_clean)
-                            numeric_candidates.append((col, fnum))
-                        except Exception:
+                            numeric_candidates.append((col, float(n.replace(',', ''))))
+                        except ValueError:
                             continue
                 except Exception:
                     continue
@@ -978,48 +1284,21 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
             return "I couldn't find a project ID column in the dataset."
         
         # Search for the project
-        project = df[df[project_id_col].astype(str).str.lower() == pid]
+        row = _project_row(df, project_id_col, pid)
 
-        if project.empty:
+        if row is None:
             return f"I couldn't find any project with ID {pid.upper()}."
 
-        row = project.iloc[0]
-
         # Create a comprehensive project information display
         result = [f"=== PROJECT INFORMATION ==="]
         result.append(f"Project ID: {pid.upper()}")
         
-        # Define field mappings with multiple possible column names
-        field_mappings = {
-            "Project Title": ['project_title', 'title', 'project_name', 'name', 'projecttitle'],
-            "Description": ['description', 'project_description', 'scope', 'project_scope'],
-            "Approved Budget": ['approvedbudgetforcontract', 'approved_budget', 'budget', 'approved_budget_num'],
-            "Contract Amount": ['contract_amount', 'contractamount', 'contract_cost'],
-            "Location": ['legislativedistrict', 'location', 'project_location', 'district'],
-            "Municipality": ['municipality', 'city', 'municipal'],
-            "Province": ['province', 'provincial'],
-            "Region": ['region', 'regions'],
-            "Contractor": ['contractor', 'contractor_name', 'contractorname', 'winning_contractor'],
-            "Consultant": ['consultant', 'consultant_name', 'consultantname'],
-            "Start Date": ['startdate', 'start_date', 'datestarted', 'commencement_date', 'contract_start'],
-            "Target Completion": ['targetcompletiondate', 'target_completion', 'planned_completion', 'contract_end'],
-            "Actual Completion": ['actualcompletiondate', 'actual_completion', 'datecompleted', 'completion_date'],
-            "Project Status": ['status', 'project_status', 'current_status'],
-            "Progress": ['progress', 'percent_complete', 'completion_percentage'],
-            "Fund Source": ['fund_source', 'funding_source', 'source_of_fund'],
-            "Implementing Office": ['implementing_office', 'office', 'implementing_unit'],
-            "Project Type": ['project_type', 'type', 'category']
-        }
+        fields, extra_columns = _lookup_layout(tuple(df.columns), project_id_col)
+        values = dict(zip(row.index, row.to_numpy()))
         
         # Process each field
-        for display_name, possible_columns in field_mappings.items():
-            value = None
-            
-            # Find the first matching column
-            for col in possible_columns:
-                if col in df.columns:
-                    value = row.get(col)
-                    break
+        for display_name, col in fields:
+            value = values[col]
             
             # Format and clean the value
             if value is not None and pd.notna(value) and str(value).strip():
@@ -1034,19 +1313,13 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
         # Add any additional columns that might contain useful information
         result.append("\n=== ADDITIONAL INFORMATION ===")
         
-        # Get columns that weren't covered by the main mappings
-        covered_columns = set()
-        for cols in field_mappings.values():
-            covered_columns.update(cols)
-        covered_columns.add(project_id_col)  # Also exclude the project ID column
-        
         additional_info_added = False
-        for col in df.columns:
-            if col.lower() not in covered_columns and pd.notna(row.get(col)) and str(row.get(col)).strip():
+        for col in extra_columns:
+            value = values[col]
+            if pd.notna(value) and str(value).strip():
                 # Clean up column name for display
                 display_col = col.replace('_', ' ').title()
-                value = str(row.get(col)).strip()
-                result.append(f"{display_col}: {value}")
+                result.append(f"{display_col}: {str(value).strip()}")
                 additional_info_added = True
         
         if not additional_info_added:
@@ -1057,31 +1330,22 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
     # If filters exist but no results → not found
     if filters and sub.empty:
         # Create a more descriptive place name
-        place_parts = []
         if "contractor" in filters:
             return f"I couldn't find any flood control projects for contractor {filters['contractor']}."
-        if "municipality" in filters:
-            place_parts.append(f"municipality of {filters['municipality']}")
-        if "province" in filters:
-            place_parts.append(f"province of {filters['province']}")
-        if "region" in filters:
-            place_parts.append(f"Region {filters['region']}")
-        if "main_island" in filters:
-            place_parts.append(filters['main_island'])
-        if "project_location" in filters:
-            place_parts.append(filters['project_location'])
+        place_parts = _place_parts(filters)
         
-        place_description = ", ".join(place_parts) if place_parts else list(filters.values())[0]
+        place_description = ", ".join(place_parts) if place_parts else next(iter(filters.values()))
         # Try to suggest nearest municipality/province by simple token inclusion
         suggestions = []
         try:
             target = str(filters.get('municipality') or filters.get('province') or '').lower()
             if target:
                 # search municipalities first
-                muc = find_column(df, ['municipality','city'])
+                muc = _location_columns(df)["municipality"]
                 if muc:
-                    vals = df[muc].dropna().astype(str).unique().tolist()
-                    matches = [v for v in vals if _normalize_lgu_text(target) in _normalize_lgu_text(v)]
+                    vals, norms = _normalized_values(df, muc)
+                    target_norm = _normalize_lgu_text(target)
+                    matches = [v for v, norm in zip(vals, norms) if target_norm in norm]
                     suggestions = [ _display_municipality(m) for m in matches[:5] ]
         except Exception:
             pass
@@ -1094,21 +1358,11 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
         n = len(sub)
         if filters:
             # Create a more descriptive place name
-            place_parts = []
+            place_parts = _place_parts(filters)
             if "contractor" in filters:
-                place_parts.append(f"contractor {filters['contractor']}")
-            if "municipality" in filters:
-                place_parts.append(f"municipality of {filters['municipality']}")
-            if "province" in filters:
-                place_parts.append(f"province of {filters['province']}")
-            if "region" in filters:
-                place_parts.append(f"Region {filters['region']}")
-            if "main_island" in filters:
-                place_parts.append(filters['main_island'])
-            if "project_location" in filters:
-                place_parts.append(filters['project_location'])
+                place_parts.insert(0, f"contractor {filters['contractor']}")
             
-            place_description = ", ".join(place_parts) if place_parts else list(filters.values())[0]
+            place_description = ", ".join(place_parts) if place_parts else next(iter(filters.values()))
             
             # Special formatting for contractor queries
             if "contractor" in filters:
@@ -1120,43 +1374,32 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
     # Sum budget
     if action == "sum" and parsed["column"]:
         # Find the correct budget column
-        budget_col = find_column(sub, ['approved_budget_num', 'approved_budget_for_contract', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost', 'approved budget for contract'])
+        budget_col = find_column(sub, _BUDGET_CANDIDATES)
         
         if budget_col is None:
             return "I couldn't find a budget column in the dataset."
 
         # Coerce to numeric to safely sum even if stored as strings
-        sub_num = sub.copy()
-        sub_num[budget_col] = pd.to_numeric(sub_num[budget_col], errors='coerce')
+        budget = _numeric_for(df, sub, budget_col)
         # If multi-location specified, show per-location totals (comparative)
         if filters.get('multi_locations'):
-            muni_col = find_column(sub_num, ['municipality','city']) or find_column(sub_num, ['province'])
+            muni_col = find_column(sub, _MUNICIPALITY_CANDIDATES) or find_column(sub, ['province'])
             if muni_col:
-                comp = sub_num.groupby(muni_col)[budget_col].sum().sort_values(ascending=False)
+                comp = budget.groupby(sub[muni_col], observed=True).sum().sort_values(ascending=False)
                 lines = [f"- {_display_municipality(str(k))}: ₱{float(v):,.2f}" for k,v in comp.items()]
                 return "Total approved budget by location:\n" + ("\n".join(lines) if lines else "No matching locations.")
-        total = sub_num[budget_col].sum()
+        total = budget.sum()
         if filters:
             # Create a more descriptive place name
-            place_parts = []
-            if "municipality" in filters:
-                place_parts.append(f"municipality of {filters['municipality']}")
-            if "province" in filters:
-                place_parts.append(f"province of {filters['province']}")
-            if "region" in filters:
-                place_parts.append(f"Region {filters['region']}")
-            if "main_island" in filters:
-                place_parts.append(filters['main_island'])
-            if "project_location" in filters:
-                place_parts.append(filters['project_location'])
+            place_parts = _place_parts(filters)
             
-            place_description = ", ".join(place_parts) if place_parts else list(filters.values())[0]
+            place_description = ", ".join(place_parts) if place_parts else next(iter(filters.values()))
             return f"The total approved budget in {place_description.title()} is ₱{total:,.2f}."
         return f"The total approved budget for all projects is ₱{total:,.2f}."
     
     # Minimum budget
     if action == "min" and parsed["column"]:
-        budget_col = find_column(sub, ['approved_budget_num', 'approved_budget_for_contract', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost', 'approved budget for contract'])
+        budget_col = find_column(sub, _BUDGET_CANDIDATES)
         
         if budget_col is None:
             return "I couldn't find a budget column in the dataset."
@@ -1164,42 +1407,28 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
         if sub.empty:
             return "I couldn't find any matching projects for your request."
         
-        # Coerce to numeric for comparison and drop rows without a valid budget
-        sub = sub.copy()
-        sub[budget_col] = pd.to_numeric(sub[budget_col], errors='coerce')
-        valid = sub.dropna(subset=[budget_col])
-        if valid.empty:
+        # Coerce to numeric for comparison; rows with a valid budget are picked by position
+        amounts = _numeric_for(df, sub, budget_col).to_numpy(dtype=float, na_value=np.nan)
+        valid_pos = np.flatnonzero(~np.isnan(amounts))
+        if not len(valid_pos):
             # All budgets are missing/invalid under this filter
-            ctx = []
-            if "municipality" in filters:
-                ctx.append(_display_municipality(filters['municipality']))
-            if "province" in filters:
-                ctx.append(filters['province'])
-            if "region" in filters:
-                ctx.append(f"Region {filters['region']}")
+            ctx = _ctx_parts(filters)
             where = f" in {', '.join(ctx)}" if ctx else ""
             return f"I couldn't find any projects with a valid approved budget{where}."
         # If requesting top-N, return N smallest from valid rows
         if top_n and top_n > 1:
-            rows = valid.nsmallest(top_n, budget_col)
-            lines = []
-            for _, r in rows.iterrows():
-                pid_col = find_project_id_column(valid)
-                pid = r.get(pid_col, 'N/A')
-                lines.append(f"- {pid}: ₱{float(r[budget_col]):,.2f}")
-            ctx = []
-            if "municipality" in filters:
-                ctx.append(_display_municipality(filters['municipality']))
-            if "province" in filters:
-                ctx.append(filters['province'])
-            if "region" in filters:
-                ctx.append(f"Region {filters['region']}")
+            order = valid_pos[pd.Series(amounts[valid_pos]).nsmallest(top_n).index.to_numpy()]
+            pid_col = find_project_id_column(sub)
+            pids = sub[pid_col].to_numpy()[order].tolist() if pid_col in sub.columns else ['N/A'] * len(order)
+            lines = [f"- {pid}: ₱{amt:,.2f}" for pid, amt in zip(pids, amounts[order].tolist())]
+            ctx = _ctx_parts(filters)
             prefix = f"Top {top_n} lowest budgets" + (f" in {', '.join(ctx)}" if ctx else "")
             return prefix + ":\n" + "\n".join(lines)
-        row = valid.loc[valid[budget_col].idxmin()]
+        pos = valid_pos[np.argmin(amounts[valid_pos])]
+        row = sub.iloc[pos]
         
         # Find project ID column
-        project_id_col = find_project_id_column(valid)
+        project_id_col = find_project_id_column(sub)
         pid = row[project_id_col] if project_id_col in row else "Unknown ID"
         
         # Figure out what table / filter matched (Municipality, Province, etc.)
@@ -1218,12 +1447,12 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
         place_description = ", ".join(place_parts) if place_parts else "the dataset"
         
         return (f"In {place_description}: The project with the lowest approved budget "
-                f"is Project ID {pid} with ₱{row[budget_col]:,.2f}.")
+                f"is Project ID {pid} with ₱{amounts[pos]:,.2f}.")
 
     # Max budget
     if action == "max" and parsed["column"]:
         # Find the correct budget column
-        budget_col = find_column(sub, ['approved_budget_num', 'approved_budget_for_contract', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost', 'approved budget for contract'])
+        budget_col = find_column(sub, _BUDGET_CANDIDATES)
         
         if budget_col is None:
             return "I couldn't find a budget column in the dataset."
@@ -1231,58 +1460,44 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
         if sub.empty:
             return "I couldn't find any projects matching that filter."
 
-        # Coerce to numeric for comparison and drop rows without a valid budget
-        sub = sub.copy()
-        sub[budget_col] = pd.to_numeric(sub[budget_col], errors='coerce')
-        valid = sub.dropna(subset=[budget_col])
-        if valid.empty:
+        # Coerce to numeric for comparison; rows with a valid budget are picked by position
+        amounts = _numeric_for(df, sub, budget_col).to_numpy(dtype=float, na_value=np.nan)
+        valid_pos = np.flatnonzero(~np.isnan(amounts))
+        if not len(valid_pos):
             # All budgets are missing/invalid under this filter
-            ctx = []
-            if "municipality" in filters:
-                ctx.append(_display_municipality(filters['municipality']))
-            if "province" in filters:
-                ctx.append(filters['province'])
-            if "region" in filters:
-                ctx.append(f"Region {filters['region']}")
+            ctx = _ctx_parts(filters)
             where = f" in {', '.join(ctx)}" if ctx else ""
             return f"I couldn't find any projects with a valid approved budget{where}."
         # If requesting top-N, return N largest from valid rows
         if top_n and top_n > 1:
-            rows = valid.nlargest(top_n, budget_col)
+            order = valid_pos[pd.Series(amounts[valid_pos]).nlargest(top_n).index.to_numpy()]
             lines = []
-            pid_col = find_project_id_column(valid)
-            for _, r in rows.iterrows():
-                pid = r.get(pid_col, 'N/A')
+            pid_col = find_project_id_column(sub)
+            pids = sub[pid_col].to_numpy()[order].tolist() if pid_col in sub.columns else ['N/A'] * len(order)
+            loc_cols = [sub[col].to_numpy()[order].tolist() for col in (find_column(sub, _MUNICIPALITY_CANDIDATES), find_column(sub, ['province'])) if col]
+            for i, (pid, amt) in enumerate(zip(pids, amounts[order].tolist())):
                 # Find location
-                location_parts = []
-                for col in [find_column(valid, ['municipality','city']), find_column(valid, ['province'])]:
-                    if col and pd.notna(r.get(col)):
-                        location_parts.append(str(r.get(col)))
+                location_parts = [str(values[i]) for values in loc_cols if pd.notna(values[i])]
                 loc = ", ".join(location_parts) if location_parts else "Unknown Location"
-                lines.append(f"- {pid} in {_display_municipality(loc)}: ₱{float(r[budget_col]):,.2f}")
-            ctx = []
-            if "municipality" in filters:
-                ctx.append(_display_municipality(filters['municipality']))
-            if "province" in filters:
-                ctx.append(filters['province'])
-            if "region" in filters:
-                ctx.append(f"Region {filters['region']}")
+                lines.append(f"- {pid} in {_display_municipality(loc)}: ₱{amt:,.2f}")
+            ctx = _ctx_parts(filters)
             prefix = f"Top {top_n} highest budgets" + (f" in {', '.join(ctx)}" if ctx else "")
             return prefix + ":\n" + "\n".join(lines)
-        row = valid.loc[valid[budget_col].idxmax()]
+        pos = valid_pos[np.argmax(amounts[valid_pos])]
+        row = sub.iloc[pos]
 
         # ✅ Use project_id if available
-        project_id_col = find_project_id_column(valid)
+        project_id_col = find_project_id_column(sub)
         project_id = row[project_id_col] if project_id_col else "N/A"
         
         # Find location with more detail
         location_parts = []
         # Resolve location columns case-insensitively
         loc_candidates = [
-            find_column(valid, ['municipality', 'city']),
-            find_column(valid, ['province']),
-            find_column(valid, ['legislative_district', 'legislativedistrict']),
-            find_column(valid, ['project_location', 'location'])
+            find_column(sub, _MUNICIPALITY_CANDIDATES),
+            find_column(sub, ['province']),
+            find_column(sub, ['legislative_district', 'legislativedistrict']),
+            find_column(sub, ['project_location', 'location'])
         ]
         for col in [c for c in loc_candidates if c]:
             if pd.notna(row.get(col)) and str(row.get(col)).strip():
@@ -1291,7 +1506,7 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
         
         location = ", ".join(location_parts) if location_parts else "Unknown Location"
 
-        value = row[budget_col]
+        value = amounts[pos]
         if pd.notna(value):
             result = f"The project with the highest budget is Project ID {project_id} in {location} with ₱{float(value):,.2f}."
         else:
@@ -1299,18 +1514,7 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
         
         # If we have filters, add context about the search area
         if filters:
-            filter_parts = []
-            if "municipality" in filters:
-                filter_parts.append(f"municipality of {filters['municipality']}")
-            if "province" in filters:
-                filter_parts.append(f"province of {filters['province']}")
-            if "region" in filters:
-                filter_parts.append(f"Region {filters['region']}")
-            if "main_island" in filters:
-                filter_parts.append(filters['main_island'])
-            if "project_location" in filters:
-                filter_parts.append(filters['project_location'])
-            
+            filter_parts = _place_parts(filters)
             if filter_parts:
                 search_area = ", ".join(filter_parts)
                 result = f"In {search_area.title()}: {result}"
@@ -1319,46 +1523,42 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
 
     # Top N projects with highest approved budget for a location (municipality/province/region)
     if action == "top_projects_by_location_budget":
-        budget_col = find_column(sub, ['approved_budget_num', 'approved_budget_for_contract', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost', 'approved budget for contract'])
+        budget_col = find_column(sub, _BUDGET_CANDIDATES)
         if budget_col is None:
             return "I couldn't find a budget column in the dataset."
         if sub.empty:
             return "I couldn't find any matching projects for that location."
-        tmp = sub.copy()
-        tmp[budget_col] = pd.to_numeric(tmp[budget_col], errors='coerce')
-        tmp = tmp.dropna(subset=[budget_col])
-        if tmp.empty:
+        budget = _numeric_for(df, sub, budget_col)
+        total = int(budget.notna().sum())
+        if not total:
             return "No projects with a valid approved budget were found for that location."
-        # Build a full sorted list once for pagination
-        tmp_sorted = tmp.sort_values(by=budget_col, ascending=False)
         force_all = bool(parsed.get("force_all"))
         n = int(top_n or 5)
-        top_rows = tmp_sorted.head(n if force_all else min(n, 5))
-        pid_col = find_project_id_column(tmp)
-        contractor_col = find_column(tmp, ['contractor', 'contractor_name', 'winning_contractor'])
-        lines = []
-        prepared: List[Tuple[str, str]] = []
-        for _, r in tmp_sorted.iterrows():
-            pid = r.get(pid_col, 'N/A')
-            contractor = r.get(contractor_col, 'Unknown Contractor') if contractor_col else 'Unknown Contractor'
-            amt = r.get(budget_col)
-            try:
-                amt_val = float(amt) if pd.notna(amt) else None
-            except Exception:
-                amt_val = None
-            prepared.append((str(pid), str(contractor), amt_val))
+        shown = min(n if force_all else min(n, 5), total)
+        pid_col = find_project_id_column(sub)
+        contractor_col = find_column(sub, _CONTRACTOR_CANDIDATES)
+        amounts = budget.to_numpy(dtype=float, na_value=np.nan)
+        pids = sub[pid_col].to_numpy() if pid_col in sub.columns else None
+        contractors = sub[contractor_col].to_numpy() if contractor_col else None
+
+        def _prepare(order: np.ndarray) -> List[Tuple[str, str, Any]]:
+            return [(str(pids[i]) if pids is not None else 'N/A',
+                     str(contractors[i]) if contractors is not None else 'Unknown Contractor',
+                     float(amounts[i])) for i in order]
+
+        # Only the first pages are selected and formatted up front; the full
+        # sorted list is built if the user pages past them.
+        if force_all:
+            prepared = _prepare(_budget_order(budget))
+        else:
+            head = _prepare(_budget_order(budget, max(n, 5) * 4))
+            prepared = head if len(head) >= total else _LazyRows(head, total, lambda: _prepare(_budget_order(budget)))
         # Store pagination state then render the first chunk
-        ctx = []
-        if "municipality" in filters:
-            ctx.append(_display_municipality(filters['municipality']))
-        if "province" in filters:
-            ctx.append(str(filters['province']))
-        if "region" in filters:
-            ctx.append(f"Region {filters['region']}")
+        ctx = _ctx_parts(filters)
         header_ctx = f"in {', '.join(ctx)}" if ctx else ""
         _set_pagination("location", filters, prepared, header_ctx)
         # consume first portion (min(5) unless force_all)
-        _PAGINATION_STATE['offset'] = len(top_rows)
+        _PAGINATION_STATE['offset'] = shown
         def _format_entry(e):
             if len(e) >= 3:
                 pid, contr, amt = e[0], e[1], e[2]
@@ -1372,9 +1572,9 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
             else:
                 return f"- {e}"
 
-        lines = [_format_entry(e) for e in prepared[:len(top_rows)]]
-        header = (f"Top {len(top_rows)} projects by approved budget" + (f" {header_ctx}" if header_ctx else "") + ":\n")
-        tail = "" if force_all or len(prepared) <= len(top_rows) else "\n\nWould you like 5 more projects?"
+        lines = [_format_entry(e) for e in prepared[:shown]]
+        header = (f"Top {shown} projects by approved budget" + (f" {header_ctx}" if header_ctx else "") + ":\n")
+        tail = "" if force_all or len(prepared) <= shown else "\n\nWould you like 5 more projects?"
         return header + ("\n".join(lines) if lines else "No projects found.") + tail
 
     if action == "more_projects":
@@ -1386,41 +1586,29 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
 
     # Top contractors by total budget
     if action == "top_contractors":
-        budget_col = find_column(sub, ['approved_budget_num', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost'])
-        contractor_col = find_column(sub, ['contractor', 'contractor_name', 'winning_contractor'])
+        budget_col = find_column(sub, _BUDGET_NUM_CANDIDATES)
+        contractor_col = find_column(sub, _CONTRACTOR_CANDIDATES)
         if not budget_col or not contractor_col:
             return "I couldn't find the required columns (contractor/budget)."
-        grp = sub.copy()
-        grp[budget_col] = pd.to_numeric(grp[budget_col], errors='coerce')
-        top = grp.groupby(contractor_col, dropna=True)[budget_col].sum().sort_values(ascending=False).head(top_n)
+        top = _contractor_totals(df, sub, agg_key, contractor_col, budget_col).head(top_n)
         lines = [f"- {k}: ₱{float(v):,.2f}" for k, v in top.items()]
         return f"Top {top_n} contractors by total budget:\n" + "\n".join(lines)
 
     # Contractor with highest total/approved budget (single winner; tie-aware)
     if action == "contractor_max_total_budget":
-        budget_col = find_column(sub, ['approved_budget_num', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost'])
-        contractor_col = find_column(sub, ['contractor', 'contractor_name', 'winning_contractor'])
+        budget_col = find_column(sub, _BUDGET_NUM_CANDIDATES)
+        contractor_col = find_column(sub, _CONTRACTOR_CANDIDATES)
         if not budget_col or not contractor_col:
             return "I couldn't find the required columns (contractor/budget)."
         if sub.empty:
             return "I couldn't find any matching projects for your request."
-        tmp = sub.copy()
-        tmp[budget_col] = pd.to_numeric(tmp[budget_col], errors='coerce')
-        agg = tmp.groupby(contractor_col, dropna=True)[budget_col].sum().sort_values(ascending=False)
+        agg = _contractor_totals(df, sub, agg_key, contractor_col, budget_col)
         if agg.empty:
             return "No contractor data found."
         max_total = float(agg.iloc[0]) if pd.notna(agg.iloc[0]) else 0.0
         top_contractors = [str(k) for k, v in agg.items() if float(v) == max_total]
         # Build context string
-        ctx = []
-        muni_disp = _display_municipality(filters['municipality']) if 'municipality' in filters else None
-        prov_disp = str(filters['province']) if 'province' in filters else None
-        if muni_disp:
-            ctx.append(muni_disp)
-        if prov_disp and not (muni_disp and prov_disp.lower() in (muni_disp or '').lower()):
-            ctx.append(prov_disp)
-        if "region" in filters:
-            ctx.append(f"Region {filters['region']}")
+        ctx = _ctx_parts(filters, dedupe_province=True)
         in_ctx = f" in {', '.join(ctx)}" if ctx else ""
 
         if len(top_contractors) == 1:
@@ -1431,48 +1619,50 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
 
     # Top N projects with highest approved budget for a contractor
     if action == "top_projects_by_contractor_budget":
-        budget_col = find_column(sub, ['approved_budget_num', 'approved_budget_for_contract', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost', 'approved budget for contract'])
-        contractor_col = find_column(sub, ['contractor', 'contractor_name', 'winning_contractor'])
+        budget_col = find_column(sub, _BUDGET_CANDIDATES)
+        contractor_col = find_column(sub, _CONTRACTOR_CANDIDATES)
         if not contractor_col or not budget_col:
             return "I couldn't find the required columns (contractor/budget)."
         # If contractor not in filters, try to infer from question again
         contractor_value = filters.get('contractor')
         if not contractor_value:
             return "Please specify a contractor name to list their top projects by approved budget."
-        # Ensure numeric budgets
-        tmp = sub.copy()
-        tmp[budget_col] = pd.to_numeric(tmp[budget_col], errors='coerce')
         # Filter to contractor explicitly to be safe
-        mask = tmp[contractor_col].astype(str).str.strip().str.lower() == str(contractor_value).strip().lower()
-        tmp = tmp[mask]
-        if tmp.empty:
+        needle = str(contractor_value).strip().lower()
+        mask = _text_mask(sub, contractor_col, lambda texts: texts == needle, strip=True)
+        if not mask.any():
             return f"I couldn't find any projects for contractor {contractor_value}."
-        # Respect requested top_n but prepare the full sorted list for pagination
+        rows = sub[mask]
+        # Ensure numeric budgets
+        budget = _numeric_for(df, sub, budget_col)[mask]
+        # Respect requested top_n; only the first pages are selected and
+        # formatted up front, the full sorted list is built on demand
         N_req = int(top_n if 'top_n' in locals() and top_n else (parsed.get('top_n') or 5))
-        tmp_sorted = tmp.sort_values(by=budget_col, ascending=False)
-        pid_col = find_project_id_column(tmp_sorted)
-        title_col = find_column(tmp_sorted, ['project_title', 'project_name', 'name', 'projecttitle'])
-        lines = []
-        prepared: List[Tuple[str, str]] = []
-        for _, r in tmp_sorted.iterrows():
-            pid = r.get(pid_col, 'N/A') if pid_col else 'N/A'
-            title = r.get(title_col) if title_col else None
-            amt = r.get(budget_col)
-            if pd.notna(amt):
+        pid_col = find_project_id_column(rows)
+        title_col = find_column(rows, ['project_title', 'project_name', 'name', 'projecttitle'])
+        amounts = budget.to_numpy(dtype=float, na_value=np.nan)
+        pids = rows[pid_col].to_numpy() if pid_col else None
+        titles = rows[title_col].to_numpy() if title_col else None
+
+        def _prepare(order: np.ndarray) -> List[Tuple[str, str]]:
+            out: List[Tuple[str, str]] = []
+            for i in order:
+                title = titles[i] if titles is not None else None
                 if title and str(title).strip():
-                    display = f"{str(title).strip()} — {format_money(float(amt))}"
+                    display = f"{str(title).strip()} — {format_money(float(amounts[i]))}"
                 else:
-                    display = f"{format_money(float(amt))}"
-                lines.append(f"- {pid}: {display}")
-                prepared.append((str(pid), display))
+                    display = f"{format_money(float(amounts[i]))}"
+                out.append((str(pids[i]) if pids is not None else 'N/A', display))
+            return out
+
+        total = int(budget.notna().sum())
+        head = _prepare(_budget_order(budget, max(N_req, 5) * 4))
+        prepared = head if len(head) >= total else _LazyRows(head, total, lambda: _prepare(_budget_order(budget)))
         # Context
-        ctx = []
+        ctx = _ctx_parts(filters)
         if "region" in filters:
-            ctx.append(f"Region {filters['region']}")
-        if "municipality" in filters:
-            ctx.append(_display_municipality(filters['municipality']))
-        if "province" in filters:
-            ctx.append(str(filters['province']))
+            # Region leads in this header
+            ctx.insert(0, ctx.pop())
         header_ctx = (" in " + ", ".join(ctx)) if ctx else ""
 
         # Store pagination and return the first page
@@ -1487,64 +1677,31 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
 
     # Top contractors by number of projects
     if action == "top_contractors_by_count":
-        contractor_col = find_column(sub, ['contractor', 'contractor_name', 'winning_contractor'])
+        contractor_col = find_column(sub, _CONTRACTOR_CANDIDATES)
         if not contractor_col:
             return "I couldn't find the contractor column in the dataset."
         # Count projects per contractor
-        counts = (
-            sub.copy()
-              .dropna(subset=[contractor_col])
-              .groupby(contractor_col, dropna=True)
-              .size()
-              .sort_values(ascending=False)
-              .head(top_n)
-        )
+        counts = _contractor_counts(df, sub, agg_key, contractor_col).head(top_n)
         # Build context string for location filters (avoid duplicate province in municipality display)
-        ctx = []
-        muni_disp = None
-        prov_disp = None
-        if "municipality" in filters:
-            muni_disp = _display_municipality(filters['municipality'])
-        if "province" in filters:
-            prov_disp = str(filters['province'])
-        if muni_disp:
-            ctx.append(muni_disp)
-        if prov_disp and not (muni_disp and prov_disp.lower() in muni_disp.lower()):
-            ctx.append(prov_disp)
-        if "region" in filters:
-            ctx.append(f"Region {filters['region']}")
+        ctx = _ctx_parts(filters, dedupe_province=True)
         prefix = f"Top {top_n} contractors by number of projects" + (f" in {', '.join(ctx)}" if ctx else "")
         lines = [f"- {k}: {int(v)} project(s)" for k, v in counts.items()]
         return prefix + ":\n" + ("\n".join(lines) if len(lines) > 0 else "No contractor data found.")
 
     # Contractor with highest number of projects (single winner; tie-aware)
     if action == "contractor_max_count":
-        contractor_col = find_column(sub, ['contractor', 'contractor_name', 'winning_contractor'])
+        contractor_col = find_column(sub, _CONTRACTOR_CANDIDATES)
         if not contractor_col:
             return "I couldn't find the contractor column in the dataset."
         if sub.empty:
             return "I couldn't find any matching projects for your request."
-        counts = (
-            sub.copy()
-              .dropna(subset=[contractor_col])
-              .groupby(contractor_col, dropna=True)
-              .size()
-              .sort_values(ascending=False)
-        )
+        counts = _contractor_counts(df, sub, agg_key, contractor_col)
         if counts.empty:
             return "No contractor data found."
         max_count = int(counts.iloc[0])
         top_contractors = [str(k) for k, v in counts.items() if int(v) == max_count]
         # Build context string
-        ctx = []
-        muni_disp = _display_municipality(filters['municipality']) if 'municipality' in filters else None
-        prov_disp = str(filters['province']) if 'province' in filters else None
-        if muni_disp:
-            ctx.append(muni_disp)
-        if prov_disp and not (muni_disp and prov_disp.lower() in (muni_disp or '').lower()):
-            ctx.append(prov_disp)
-        if "region" in filters:
-            ctx.append(f"Region {filters['region']}")
+        ctx = _ctx_parts(filters, dedupe_province=True)
         in_ctx = f" in {', '.join(ctx)}" if ctx else ""
 
         if len(top_contractors) == 1:
@@ -1555,28 +1712,26 @@ def agent3_run(question: str, df: pd.DataFrame) -> str:
 
     # Trend by year (total budget per year)
     if action == "trend_by_year":
-        budget_col = find_column(sub, ['approved_budget_num', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost'])
+        budget_col = find_column(sub, _BUDGET_NUM_CANDIDATES)
         year_source = find_column(sub, ['start_date_parsed','start_date','funding_year'])
         if not budget_col or not year_source:
             return "I couldn't find columns needed for trend (budget/year)."
-        tmp = sub.copy()
-        if 'year' not in tmp.columns:
-            y = pd.to_datetime(tmp[year_source], errors='coerce').dt.year if 'date' in year_source else pd.to_numeric(tmp[year_source], errors='coerce')
-            tmp['year'] = y
-        tmp[budget_col] = pd.to_numeric(tmp[budget_col], errors='coerce')
-        series = tmp.groupby('year')[budget_col].sum().sort_index()
+        if 'year' in sub.columns:
+            years = sub['year']
+        else:
+            years = pd.to_datetime(sub[year_source], errors='coerce').dt.year if 'date' in year_source else pd.to_numeric(sub[year_source], errors='coerce')
+        # Only the budget and year columns are needed, so no copy of sub
+        series = _numeric_for(df, sub, budget_col).groupby(years).sum().sort_index()
         lines = [f"- {int(y)}: ₱{float(v):,.2f}" for y, v in series.items() if pd.notna(y)]
         return "Total approved budget by year:\n" + ("\n".join(lines) if lines else "No yearly data available")
 
     # Municipality with highest total budget in a region/area
     if action == "municipality_max_total":
-        budget_col = find_column(sub, ['approved_budget_num', 'approvedbudgetforcontract', 'approved_budget', 'budget', 'contractcost'])
-        muni_col = find_column(sub, ['municipality','city'])
+        budget_col = find_column(sub, _BUDGET_NUM_CANDIDATES)
+        muni_col = find_column(sub, _MUNICIPALITY_CANDIDATES)
         if not budget_col or not muni_col:
             return "I couldn't find columns needed (municipality/budget)."
-        tmp = sub.copy()
-        tmp[budget_col] = pd.to_numeric(tmp[budget_col], errors='coerce')
-        agg = tmp.groupby(muni_col)[budget_col].sum().sort_values(ascending=False)
+        agg = _numeric_for(df, sub, budget_col).groupby(sub[muni_col], observed=True).sum().sort_values(ascending=False)
         if agg.empty:
             return "No municipalities found for that area."
         muni = agg.index[0]
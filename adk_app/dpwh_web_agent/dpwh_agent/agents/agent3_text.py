@@ -0,0 +1,213 @@
+"""Prompt-only parsing for agent3: patterns, region aliases and year/top-N parsing.
+
+Nothing here touches a DataFrame, so this module imports neither pandas nor
+numpy and can be compiled ahead of time on its own.
+"""
+from typing import Any, Dict, Optional, Tuple
+import datetime
+import functools
+import re
+
+
+ROMAN_MAP = {
+    "1": "i", "2": "ii", "3": "iii", "4": "iv", "5": "v",
+    "6": "vi", "7": "vii", "8": "viii", "9": "ix", "10": "x",
+    "11": "xi", "12": "xii", "13": "xiii", "14": "xiv", "15": "xv",
+    "16": "xvi", "17": "xvii", "18": "xviii"
+}
+
+_ROMAN_NUMERALS = frozenset(ROMAN_MAP.values())
+
+@functools.lru_cache(maxsize=128)
+def _region_patterns(pat: str) -> Tuple[str, ...]:
+    """Lowercased region values (or "region ..." prefixes) that a region filter matches."""
+    patterns = []
+    
+    # If input is a digit (e.g., "2" or "3"), convert to roman and add "region" prefix
+    if pat.isdigit():
+        roman = ROMAN_MAP.get(pat, pat)
+        patterns.extend([
+            f"region {roman}",      # "region ii"
+            f"region {pat}",         # "region 2"
+        ])
+    # If input is already roman (e.g., "ii" or "iii")
+    elif pat in _ROMAN_NUMERALS:
+        patterns.extend([
+            f"region {pat}",         # "region ii"
+        ])
+    else:
+        patterns.append(pat)
+    
+    # Special handling for Region 4/IV
+    if pat in ['4', 'iv']:
+        patterns.extend([
+            'region iv-a', 'region iv-b',
+            'region 4-a', 'region 4-b',
+            'calabarzon', 'mimaropa'
+        ])
+    
+    if pat in ['4a', 'iv-a']:
+        patterns.extend(['region iv-a', 'region 4-a', 'calabarzon'])
+    if pat in ['4b', 'iv-b']:
+        patterns.extend(['region iv-b', 'region 4-b', 'mimaropa'])
+    return tuple(patterns)
+
+
+# detect_filters patterns
+_RE_REGION_IVAB = re.compile(r"region\s*(?:iv-?|4)?\s*[–-]?\s*([ab])")
+_RE_NCR = re.compile(r"\bncr\b|national capital region|metro manila|ncr")
+_RE_CAR = re.compile(r"\bcar\b|cordillera|cordillera administrative region|car")
+_RE_DAVAO = re.compile(r"\bdavao\b")
+_RE_DAVAO_CITY = re.compile(r"\bdavao\s*,?\s*city\b|\bdavao\s+city\b")
+_RE_DAVAO_PROVINCE = re.compile(r"davao\s+(del\s+norte|del\s+sur|de\s+oro|occidental|oriental)")
+_RE_DAVAO_REGION = re.compile(r"davao region|region\s*(xi|11)")
+_RE_REGION_NUM = re.compile(r"region\s*([0-9ivx]+)")
+_RE_NAMED_CITY = re.compile(r"\b([a-zA-Z][a-zA-Z\s\.'\-&]{1,60})\s*,?\s*city\b", re.I)
+_RE_IN_LOCATIONS = re.compile(r"\bin\s+([a-z\s,\/]+)(?:\?|$)")
+_RE_LOCATION_SEP = re.compile(r"\s*(?:,|\/|\band\b|\bor\b)\s*")
+
+# _parse_top_n / _parse_time_filters patterns
+_RE_TOP_N = re.compile(r"\btop\s+(\d{1,3})\b")
+_RE_YEAR_BETWEEN = re.compile(r"between\s+(\d{4})\s+and\s+(\d{4})")
+_RE_YEAR_RANGE = re.compile(r"(\d{2,4})\s*(?:-|–|—|to)\s*(\d{2,4})")
+_RE_YEAR_LIST = re.compile(r"\d{2,4}")
+_RE_IN_YEAR = re.compile(r"\b(in|for)\s+(\d{4})\b")
+_RE_COMPLETED_IN = re.compile(r"completed\s+in\s+(\d{4})")
+_RE_ONGOING = re.compile(r"\bongoing\b")
+_RE_COMPLETED = re.compile(r"\bcompleted\b")
+
+def _today_year() -> int:
+    return datetime.date.today().year
+
+
+def _copy_filters(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a memoized filter dict that callers may freely modify."""
+    return {k: (list(v) if isinstance(v, list) else v) for k, v in filters.items()}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_top_n(prompt: str) -> Optional[int]:
+    m = _RE_TOP_N.search(prompt.lower())
+    if m:
+        try:
+            n = int(m.group(1))
+            return n if n > 0 else None
+        except Exception:
+            return None
+    return None
+
+def _parse_time_filters(prompt: str) -> Dict[str, Any]:
+    # Relative phrases ("last year") depend on the current year, so it is part of the key
+    return _copy_filters(_parse_time_filters_cached(prompt, _today_year()))
+
+@functools.lru_cache(maxsize=256)
+def _parse_time_filters_cached(prompt: str, today_year: int) -> Dict[str, Any]:
+    p = prompt.lower()
+    t: Dict[str, Any] = {}
+    # Year range: between 2021 and 2023
+    m = _RE_YEAR_BETWEEN.search(p)
+    if m:
+        a, b = int(m.group(1)), int(m.group(2))
+        t["year_range"] = (min(a,b), max(a,b))
+        return t
+    # Year range with hyphen or 'to', e.g. '2021-2023' or '2021 to 2023'
+    m = _RE_YEAR_RANGE.search(p)
+    if m:
+        a, b = int(m.group(1)), int(m.group(2))
+        # normalize two-digit years to 2000s
+        if a < 100:
+            a += 2000
+        if b < 100:
+            b += (a // 100) * 100
+        t["year_range"] = (min(a,b), max(a,b))
+        return t
+    # Comma or space separated list of years: '2020,2021' or '2020 2021'
+    nums = _RE_YEAR_LIST.findall(p)
+    if len(nums) >= 2:
+        years = []
+        for n in nums:
+            y = int(n)
+            if y < 100:
+                y += 2000
+            years.append(y)
+        # unique and sorted
+        years = sorted(list(dict.fromkeys(years)))
+        t["years"] = years
+        return t
+    # Single year: in 2023 / for 2024
+    m = _RE_IN_YEAR.search(p)
+    if m:
+        t["year"] = int(m.group(2))
+    # Completed in YEAR
+    m = _RE_COMPLETED_IN.search(p)
+    if m:
+        t["completed_year"] = int(m.group(1))
+    # Relative years
+    if "last year" in p:
+        t["year"] = today_year - 1
+    if "this year" in p:
+        t["year"] = today_year
+    # Status keywords
+    if _RE_ONGOING.search(p):
+        t["status"] = "ongoing"
+    if _RE_COMPLETED.search(p) and "completed_year" not in t:
+        t["status"] = "completed"
+    return t
+
+
+
+# Words each simple_parse branch needs verbatim; one overlapping scan tells
+# which branches can possibly match. No word is a prefix of another.
+_RE_PARSE_HINTS = re.compile(r"(?=(top|budget|contractor|list|give me all|how many|sum|cost|trend|by year|per year|municipality))")
+
+# simple_parse intent patterns
+_RE_TOP_BUDGET_FOR = re.compile(r"top\s+\d+\s+(?:with\s+the\s+)?(?:highest\s+)?(?:approved\s+)?budget\s+(?:of|for|by)\s+(.+)$")
+_RE_LIST_TOP_BUDGET_FOR = re.compile(r"list\s+the\s+top\s+(\d+)\s+(?:with\s+the\s+)?(?:highest\s+)?(?:approved\s+)?budget\s+(?:of|for|by)\s+(.+)$")
+_RE_HIGHEST_BUDGET = re.compile(r"highest\s+(?:total\s+)?(?:approved\s+)?budget")
+_RE_WHO_CONTRACTOR_MAX_BUDGET = re.compile(r"who\s+(?:is\s+)?the\s+contractor\s+with\s+(?:the\s+)?highest\s+(?:total\s+)?(?:approved\s+)?budget")
+_RE_WHICH_CONTRACTOR_MAX_BUDGET = re.compile(r"which\s+contractor\s+(?:has|with)\s+(?:the\s+)?highest\s+(?:total\s+)?(?:approved\s+)?budget")
+_RE_LIST_ALL_PROJECTS = re.compile(r"list all .*projects")
+_RE_GIVE_ALL_IN = re.compile(r"give me all\s+\d+\s+projects\s+in")
+_RE_GIVE_ALL_N = re.compile(r"give me all\s+(\d+)\s+projects")
+_RE_N_MORE = re.compile(r"(\d+)\s+more\s+projects?")
+_RE_COUNT_CONTRACTOR_HAVE = re.compile(r"how many projects\s+contractor\s+(.+?)\s+have\b")
+_RE_TRAILING_IN = re.compile(r"in\s+([a-z\s\-]+)$")
+_RE_TOP_CONTRACTORS_BUDGET = re.compile(r"top\s+\d+\s+contractors\s+by\s+(?:total\s+)?budget")
+_RE_TOP_CONTRACTORS_COUNT = re.compile(r"top\s+\d+\s+contractors\s+by\s+(?:number\s+of\s+projects|project\s+count|projects)")
+_RE_MOST_PROJECTS = re.compile(r"which\s+contractor\s+(?:has|with)\s+(?:the\s+)?(?:most|highest|largest)\s+(?:number\s+of\s+)?projects?")
+_RE_WHO_CONTRACTOR_MOST = re.compile(r"who\s+is\s+the\s+contractor\s+with\s+(?:the\s+)?(?:most|highest|largest)\s+(?:number\s+of\s+)?projects?")
+_RE_HIGHEST_PROJECTS = re.compile(r"highest\s+number\s+of\s+projects?")
+_RE_MUNI_MAX = re.compile(r"which\s+municipality.*highest\s+total\s+budget")
+_RE_PROJECT_ID = re.compile(r"(project\s*id|projectid)\s*([a-z0-9\-]+)")
+_RE_FIELD_LOOKUP_HINT = re.compile(r"who is the contractor|what is the budget|when|where is|what is the location|what is the cost|who is the consultant|what is the status")
+_RE_CONTRACTOR_LOOKUP = re.compile(r"who is the contractor.*?([a-z][a-z0-9\-]{5,19})(?:\s|$)")
+_RE_BUDGET_LOOKUP = re.compile(r"what is the budget.*?([a-z][a-z0-9\-]{5,19})(?:\s|$)")
+_RE_START_LOOKUP = re.compile(r"when did.*?([a-z][a-z0-9\-]{5,19}).*start")
+_RE_COMPLETION_LOOKUP = re.compile(r"when.*?([a-z][a-z0-9\-]{5,19}).*(complet|finish)")
+_RE_LOCATION_LOOKUP = re.compile(r"(where is|what is the location).*?([a-z][a-z0-9\-]{5,19})(?:\s|$)")
+_RE_DETAIL_LOOKUP = re.compile(r"(what is the cost|who is the consultant|what is the status).*?([a-z][a-z0-9\-]{5,19})(?:\s|$)")
+_RE_NON_NUMERIC = re.compile(r"[^0-9.\-]")
+_RE_ONLY_SIGNS = re.compile(r"[\.-]+")
+_RE_NUMERIC_SUBSTRING = re.compile(r"[0-9]{1,3}(?:[,0-9]{0,})?(?:\.[0-9]+)?|[0-9]+(?:\.[0-9]+)?")
+_RE_FULL_PID = re.compile(r"^([a-z0-9\-]{6,20})$")
+_RE_COUNT_CONTRACTOR_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"how many projects.*contractor.*have\s+(.+)$",
+    r"how many projects.*does\s+(.+?)\s+have",
+    r"how many projects.*by\s+(.+)$",
+    r"how many projects.*from\s+(.+)$",
+    r"how many projects\s+(.+?)\s+(?:does|do)\s+have",  # ✅ NEW: "projects X does have"
+    r"contractor\s+have\s+(.+?)(?:\?|$)",  # ✅ NEW: "contractor have X"
+))
+_RE_CONTRACTOR_FILLER = re.compile(r'\b(contractor|company|corp|inc|ltd|does|have)\b', re.IGNORECASE)
+
+# Keyword lists for the max/min/sum intents, each matched as one alternation
+_HIGHEST_KEYWORDS = ("highest approved budget", "max approved budget", "highest budget", "max budget", "largest budget", "biggest budget")
+_LOWEST_KEYWORDS = ("lowest approved budget", "min approved budget", "minimum approved budget", "lowest budget", "minimum budget", "least budget")
+_TOTAL_KEYWORDS = ("total budget", "sum", "overall budget", "cost", "total cost", "total approved budget")
+_RE_HIGHEST_KW = re.compile("|".join(map(re.escape, _HIGHEST_KEYWORDS)))
+_RE_LOWEST_KW = re.compile("|".join(map(re.escape, _LOWEST_KEYWORDS)))
+_RE_TOTAL_KW = re.compile("|".join(map(re.escape, _TOTAL_KEYWORDS)))
+
+# Whole-prompt pagination follow-ups
+_AFFIRMATIONS = frozenset({"yes", "yeah", "yep", "sure", "ok", "okay", "please"})
+_MORE_REQUESTS = frozenset({"more", "more projects", "show more", "5 more", "5 more projects"})
@@ -7,6 +7,10 @@ from typing import Iterable, Optional
 import pandas as pd
 
 
+_RE_CAMEL_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+_RE_NON_ALNUM_RUN = re.compile(r"[^a-z0-9]+")
+
+
 def normalize_column(col: str) -> str:
     """
     Convert column names to snake_case (handles CamelCase + spaces and symbols).
@@ -15,14 +19,14 @@ def normalize_column(col: str) -> str:
     if not isinstance(col, str):
         return str(col)
     # Insert underscores before capitals, lowercase, replace non-word with underscore, collapse repeats
-    s = re.sub(r"(?<!^)(?=[A-Z])", "_", col).lower()
-    s = re.sub(r"[^a-z0-9]+", "_", s).strip("_")
+    s = _RE_CAMEL_BOUNDARY.sub("_", col).lower()
+    s = _RE_NON_ALNUM_RUN.sub("_", s).strip("_")
     return s
 
 
 def _norm_key(name: str) -> str:
     """Normalize a column or candidate name for case/format-insensitive matching."""
-    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+    return _RE_NON_ALNUM_RUN.sub("", str(name).lower())
 
 
 @lru_cache(maxsize=1024)
@@ -41,8 +45,12 @@ def find_column(df: pd.DataFrame, candidates: Iterable[str]) -> Optional[str]:
     """
     if df is None or not hasattr(df, "columns") or len(df.columns) == 0:
         return None
+    # The answer depends only on the column names, so it is shared across frames
+    return _find_column_cached(tuple(df.columns), tuple(candidates))
+
 
-    cols = list(df.columns)
+@lru_cache(maxsize=1024)
+def _find_column_cached(cols: tuple, candidates: tuple) -> Optional[str]:
     norm_map = {_norm_key(c): c for c in cols}
 
     # 1) exact normalized match
@@ -59,25 +67,31 @@ def find_column(df: pd.DataFrame, candidates: Iterable[str]) -> Optional[str]:
                 return col
 
     # 3) fuzzy matching with RapidFuzz (optional)
+    queries = [q for q in (_norm_key(cand) for cand in candidates) if q]
+    # fuzz.ratio can reach 85 only if 2*min(len)/(sum of lens) >= 0.85, so
+    # columns whose length is too far from every query are never scored.
+    lengths = {len(q) for q in queries}
+    choices = [
+        (col, key) for col, key in ((c, _norm_key(c)) for c in cols)
+        if any(200 * min(n, len(key)) >= 85 * (n + len(key)) for n in lengths)
+    ]
+    if not choices:
+        return None
     try:
         from rapidfuzz import process, fuzz  # type: ignore
 
-        choices = {c: _norm_key(c) for c in cols}
-        for cand in candidates:
-            query = _norm_key(cand)
-            if not query:
-                continue
-            match = process.extractOne(
-                query,
-                choices,
-                scorer=fuzz.ratio,
-                score_cutoff=85,
-            )
-            if match:
-                # match is a tuple like (best_key, score, original_key_or_index)
-                best_col = match[2] if len(match) > 2 else match[0]
-                # best_col may be the original column name if provided as mapping
-                return best_col
+        # Score every candidate against every remaining column in one call;
+        # scores below the cutoff come back as 0.
+        scores = process.cdist(
+            queries,
+            [key for _, key in choices],
+            scorer=fuzz.ratio,
+            score_cutoff=85,
+        )
+        for row in scores:
+            best = int(row.argmax())
+            if row[best] >= 85:
+                return choices[best][0]
     except Exception:
         # RapidFuzz not installed or failed; ignore
         pass
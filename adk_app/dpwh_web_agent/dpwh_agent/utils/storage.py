@@ -1,34 +1,153 @@
+import atexit
 import json
+import logging
 import os
+import queue
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional fast JSON
+    orjson = None
+
 # Toggle saving via environment; default is OFF (no sessions are saved)
 # Set SAVE_SESSIONS=1 to enable persistence.
 SAVE_SESSIONS = str(os.environ.get("SAVE_SESSIONS", "0")).lower() in {"1", "true", "yes", "on"}
 
 SESSION_DIR = Path(os.environ.get("SESSION_DIR", "./sessions"))
+# Sidecar file holding the id of the most recently written session.
+LATEST_POINTER = ".latest"
 if SAVE_SESSIONS:
     SESSION_DIR.mkdir(parents=True, exist_ok=True)
 
+logger = logging.getLogger(__name__)
+
+# Session files are written by a single background thread so the request
+# path only pays for serialization and a queue put. The queue is drained at
+# interpreter exit.
+_writer_q: "queue.Queue[tuple[str, bytes]]" = queue.Queue(maxsize=1024)
+_writer_lock = threading.Lock()
+_writer_thread = None
+
+
+def _serialize(data: dict) -> bytes:
+    """Session JSON as bytes.
+
+    With orjson, NaN and infinite floats are written as null; the stdlib
+    fallback writes them as NaN/Infinity tokens like the json module always has.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _atomic_write(path: Path, payload: bytes):
+    """Write via a temp file and os.replace so readers never see a partial file."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _write_session(session_id: str, payload: bytes):
+    _atomic_write(SESSION_DIR / f"{session_id}.json", payload)
+    _atomic_write(SESSION_DIR / LATEST_POINTER, session_id.encode("utf-8"))
+
+
+def _writer_loop():
+    while True:
+        session_id, payload = _writer_q.get()
+        try:
+            _write_session(session_id, payload)
+        except Exception:
+            logger.exception("Failed to write session %s", session_id)
+        finally:
+            _writer_q.task_done()
+
+
+def _ensure_writer():
+    global _writer_thread
+    if _writer_thread is not None:
+        return
+    with _writer_lock:
+        if _writer_thread is None:
+            t = threading.Thread(target=_writer_loop, name="session-writer", daemon=True)
+            t.start()
+            _writer_thread = t
+            atexit.register(_flush_sessions)
+
+
+def _flush_sessions():
+    """Block until every queued session has been written."""
+    if _writer_thread is not None:
+        _writer_q.join()
+
+
 def save_session(session_id: str, data: dict):
-    """Persist session data if SAVE_SESSIONS is enabled; otherwise no-op."""
+    """Persist session data if SAVE_SESSIONS is enabled; otherwise no-op.
+
+    The data is serialized here, so later changes to it are not saved and
+    serialization errors reach the caller. The file write happens on a
+    background thread, so the session is not yet on disk when this returns;
+    load_last_session waits for pending writes. If the queue is full this
+    blocks until there is room.
+    """
     if not SAVE_SESSIONS:
         return
-    path = SESSION_DIR / f"{session_id}.json"
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    payload = _serialize(data)
+    _ensure_writer()
+    _writer_q.put((session_id, payload))
 
 def load_last_session():
     """Load the most recent session if persistence is enabled; otherwise return None."""
     if not SAVE_SESSIONS:
         return None
-    files = sorted(SESSION_DIR.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not files:
+    # Sessions queued by save_session must be on disk before resolving the latest
+    _flush_sessions()
+    path = _latest_session_path()
+    if path is None:
         return None
-    with open(files[0], "r", encoding="utf-8") as f:
+    if orjson is not None:
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Files written by the json module may hold NaN/Infinity tokens
+            return json.loads(raw)
+    with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
+def _latest_session_path():
+    """Resolve the newest session file via the .latest pointer, else by mtime."""
+    try:
+        session_id = (SESSION_DIR / LATEST_POINTER).read_text(encoding="utf-8").strip()
+    except OSError:
+        session_id = ""
+    if session_id:
+        path = SESSION_DIR / f"{session_id}.json"
+        if path.is_file():
+            return path
+    try:
+        with os.scandir(SESSION_DIR) as it:
+            newest = max(
+                (e for e in it if e.name.endswith(".json") and e.is_file()),
+                key=lambda e: e.stat().st_mtime,
+                default=None,
+            )
+    except OSError:
+        return None
+    return Path(newest.path) if newest is not None else None
+
 def new_session_id():
     # use timezone-aware datetime
     return datetime.now(timezone.utc).strftime("session-%Y%m%dT%H%M%SZ")
@@ -1,6 +1,22 @@
+import functools
 import re
 import unicodedata
 
+import pandas as pd
+
+# normalize_lgu_text patterns
+_RE_LGU_PREFIX = re.compile(r"\b(city of|municipality of|municipality|city)\b")
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9\s\-]")
+_RE_DASH = re.compile(r"[\-]")
+_RE_WS = re.compile(r"\s+")
+# display_municipality patterns
+_RE_CITY_OF = re.compile(r"^CITY OF\s+", re.IGNORECASE)
+_RE_METRO_MANILA = re.compile(r"\bMETROPOLITAN MANILA\b", re.IGNORECASE)
+# Every ASCII character either pattern above would blank out, as one translate table
+_TO_SPACE = str.maketrans({
+    c: " " for c in map(chr, range(128)) if _RE_NON_ALNUM.match(c) or _RE_DASH.match(c)
+})
+
 
 def normalize_lgu_text(s: str) -> str:
     """
@@ -12,15 +28,30 @@ def normalize_lgu_text(s: str) -> str:
     """
     if not isinstance(s, str):
         return ""
-    s_norm = unicodedata.normalize('NFKD', s)
-    s_ascii = s_norm.encode('ascii', 'ignore').decode('ascii').lower()
-    s_ascii = re.sub(r"\b(city of|municipality of|municipality|city)\b", " ", s_ascii)
-    s_ascii = re.sub(r"[^a-z0-9\s\-]", " ", s_ascii)
-    s_ascii = re.sub(r"[\-]", " ", s_ascii)
-    s_ascii = re.sub(r"\s+", " ", s_ascii).strip()
-    return s_ascii
+    if s.isascii():
+        # NFKD and the ASCII round-trip leave ASCII text unchanged
+        s_ascii = s.lower()
+    else:
+        s_norm = unicodedata.normalize('NFKD', s)
+        s_ascii = s_norm.encode('ascii', 'ignore').decode('ascii').lower()
+    s_ascii = _RE_LGU_PREFIX.sub(" ", s_ascii).translate(_TO_SPACE)
+    return " ".join(s_ascii.split())
+
+
+def normalize_lgu_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized normalize_lgu_text over a Series of strings
+    (non-string entries become "").
+    """
+    s = values.astype(object)
+    s = s.where(s.map(type).eq(str), "")
+    s = s.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii').str.lower()
+    s = s.str.replace(_RE_LGU_PREFIX, " ", regex=True).str.translate(_TO_SPACE)
+    return s.str.replace(_RE_WS, " ", regex=True).str.strip()
 
 
+# The dataset has a small fixed set of municipality names, so cache the renderings
+@functools.lru_cache(maxsize=4096)
 def display_municipality(name: str) -> str:
     """
     Render municipality nicely:
@@ -32,8 +63,8 @@ def display_municipality(name: str) -> str:
     parts = [p.strip() for p in s.split(',')]
     city = parts[0]
     rest = ", ".join(parts[1:]) if len(parts) > 1 else ""
-    city_norm = re.sub(r"^CITY OF\s+", "", city, flags=re.IGNORECASE).title()
-    if re.match(r"^CITY OF\s+", city, flags=re.IGNORECASE):
+    city_norm = _RE_CITY_OF.sub("", city).title()
+    if _RE_CITY_OF.match(city):
         city_norm = f"{city_norm} City"
-    rest = re.sub(r"\bMETROPOLITAN MANILA\b", "Metro Manila", rest, flags=re.IGNORECASE)
+    rest = _RE_METRO_MANILA.sub("Metro Manila", rest)
     return f"{city_norm}, {rest}".strip(', ')
@@ -2,18 +2,17 @@ from __future__ import annotations
 
 from google.adk.agents import Agent  # type: ignore
 
-from dpwh_web_agent.dpwh_agent.agents.agent1_fetch import agent1_run
+from dpwh_web_agent.dpwh_agent.agents.agent1_fetch import agent1_run, load_dataset
 from dpwh_web_agent.dpwh_agent.agentic import tools as dpwh_tools
-import pandas as pd
 
 
 def ensure_dataset() -> str:
     """Ensure the dataset is loaded and registered for downstream tools."""
     try:
-        csv_path = agent1_run()
-        df = pd.read_csv(csv_path)
+        dataset_path = agent1_run()
+        df = load_dataset(dataset_path)
         dpwh_tools.set_dataframe(df)
-        return f"Dataset loaded: {csv_path.name} (rows={len(df)})"
+        return f"Dataset loaded: {dataset_path.name} (rows={len(df)})"
     except Exception as e:
         return f"Failed to load dataset: {e}"
 